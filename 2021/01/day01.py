@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+DAY = 1
+# https://adventofcode.com/2021/day/1
+
+import argparse
+import collections
+import itertools
+import logging
+import os
+from typing import Iterable, Iterator
+
+
+TEST_DATA = f"day{DAY:02}test_input.txt"
+REAL_DATA = f"day{DAY:02}input.txt"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=f"AdventOfCode: Day {DAY}")
+    parser.set_defaults(
+        input_filename=None,
+        real=True,
+        verbose=False,
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--test", "-t", dest="real", action="store_false",
+        help=f"Use {TEST_DATA!r} as input_filename")
+    group.add_argument(
+        "--real", "-r", dest="real", action="store_true",
+        help="Use {REAL_DATA!r} as input_filename")
+
+    parser.add_argument(
+        "--input", "-i", dest="input_filename",
+        help="Read the depths from this file instead")
+    parser.add_argument(
+        "--window", "-w", type=int, default=3,
+        help="Window size for part 2 (default: %(default)s)")
+    parser.add_argument(
+        "--verbose", "-v", action="store_true",
+        help="More verbose logging")
+    namespace = parser.parse_args()
+
+    if not namespace.input_filename:
+        namespace.input_filename = REAL_DATA if namespace.real else TEST_DATA
+    log_level = logging.DEBUG if namespace.verbose else logging.INFO
+    logging.basicConfig(level=log_level)
+
+    return namespace
+
+
+def read_data(input_filename: str):
+    with open(os.path.join(os.path.dirname(__file__), input_filename)) as f:
+        return f.readlines()
+
+
+def parse_depths(lines: Iterable[str]) -> Iterator[int]:
+    # int() ignores the surrounding whitespace; skip blank lines
+    return map(int, filter(str.strip, lines))
+
+
+def parse_data(text_data: list[str]) -> list[int]:
+    return list(parse_depths(text_data))
+
+
+def read_depths(input_filename: str) -> Iterator[int]:
+    """Stream the depths from the file, one line at a time"""
+    with open(os.path.join(os.path.dirname(__file__), input_filename)) as f:
+        yield from parse_depths(f)
+
+
+def window_increases(depths: Iterable[int], window_size: int) -> int:
+    """How many windows have a larger sum than the window before.
+
+    Adjacent windows share all but their first and last readings, so
+    the sum grows exactly when the reading entering the window is larger
+    than the one leaving it; no sums are needed.
+    """
+    if window_size < 1:
+        raise ValueError(f"window_size must be at least 1, not {window_size}")
+    depths = iter(depths)
+    window = collections.deque(itertools.islice(depths, window_size),
+                               maxlen=window_size)
+    increased = 0
+    for depth in depths:
+        if depth > window[0]:
+            increased += 1
+        window.append(depth)
+    return increased
+
+
+def compute1(depths: Iterable[int]) -> int:
+    return window_increases(depths, 1)
+
+
+def compute2(depths: Iterable[int], window_size: int = 3) -> int:
+    return window_increases(depths, window_size)
+
+
+def main():
+    namespace = parse_args()
+    logging.info("%s", namespace.input_filename)
+    result1 = compute1(read_depths(namespace.input_filename))
+    print(f"{result1=}")
+    result2 = compute2(read_depths(namespace.input_filename),
+                       namespace.window)
+    print(f"{result2=}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
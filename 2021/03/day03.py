@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+DAY = 3
+# https://adventofcode.com/2021/day/3
+
+import argparse
+import logging
+import os
+from array import array
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+TEST_DATA = f"day{DAY:02}test_input.txt"
+REAL_DATA = f"day{DAY:02}input.txt"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=f"AdventOfCode: Day {DAY}")
+    parser.set_defaults(
+        input_filename=None,
+        real=True,
+        verbose=False,
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--test", "-t", dest="real", action="store_false",
+        help=f"Use {TEST_DATA!r} as input_filename")
+    group.add_argument(
+        "--real", "-r", dest="real", action="store_true",
+        help="Use {REAL_DATA!r} as input_filename")
+
+    parser.add_argument(
+        "--backend", "-B", choices=("python", "numpy"), default="python",
+        help="Implementation to run (default: %(default)s)")
+    parser.add_argument(
+        "--verbose", "-v", action="store_true",
+        help="More verbose logging")
+    namespace = parser.parse_args()
+    if namespace.backend == "numpy" and np is None:
+        parser.error("--backend numpy needs NumPy")
+
+    namespace.input_filename = REAL_DATA if namespace.real else TEST_DATA
+    log_level = logging.DEBUG if namespace.verbose else logging.INFO
+    logging.basicConfig(level=log_level)
+
+    return namespace
+
+
+def read_data(input_filename: str):
+    with open(os.path.join(os.path.dirname(__file__), input_filename)) as f:
+        return f.readlines()
+
+
+def parse_data(text_data: list[str]) -> list[str]:
+    return [line.strip() for line in text_data if line.strip()]
+
+
+def to_bin(n, bit_count):
+    return f"{n:0{bit_count}b}"
+
+
+def count_ones(data: list[str]) -> list[int]:
+    """How many lines have a 1 in each bit column, counting each column
+    of one joined string at C speed"""
+    width = len(data[0])
+    joined = "".join(data)
+    return [joined[b::width].count("1") for b in range(width)]
+
+
+def compute1(data: list[str]) -> int:
+    bit_count = len(data[0])
+    gamma = 0
+    epsilon = 0
+    for b, one in enumerate(reversed(count_ones(data))):
+        zero = len(data) - one
+        mask = 1 << b
+        if one > zero:
+            gamma |= mask
+        elif one < zero:
+            epsilon |= mask
+        logging.debug("%2d, %s, 0=%d, 1=%d",
+                      b, to_bin(mask, bit_count), zero, one)
+    return gamma * epsilon
+
+
+def build_trie(values: Iterable[int], bits: int) -> tuple[array, array]:
+    """A binary trie of bits-wide numbers, most significant bit first.
+
+    Node 0 is the root. children[2 * node + bit] is the child for that
+    bit, or 0 for none, and counts[node] is how many numbers lie below.
+    """
+    children = array("L", [0, 0])
+    counts = array("L", [0])
+    for value in values:
+        node = 0
+        counts[0] += 1
+        for shift in range(bits - 1, -1, -1):
+            slot = 2 * node + ((value >> shift) & 1)
+            child = children[slot]
+            if not child:
+                child = children[slot] = len(counts)
+                children.extend((0, 0))
+                counts.append(0)
+            counts[child] += 1
+            node = child
+    return children, counts
+
+
+def choose_bit(zeros: int, ones: int, most: bool) -> int:
+    """The most (ties: 1) or least (ties: 0) common bit. A bit that no
+    remaining number has cannot be chosen."""
+    if not zeros or not ones:
+        return 1 if ones else 0
+    if most:
+        return 1 if ones >= zeros else 0
+    return 0 if zeros <= ones else 1
+
+
+def trie_rating(trie: tuple[array, array], bits: int, most: bool) -> int:
+    """Follow the most or least common bit down the trie, in O(bits)"""
+    children, counts = trie
+    node = value = 0
+    for _ in range(bits):
+        zero, one = children[2 * node], children[2 * node + 1]
+        bit = choose_bit(counts[zero] if zero else 0,
+                         counts[one] if one else 0, most)
+        value = (value << 1) | bit
+        node = one if bit else zero
+    return value
+
+
+def compute2(data: list[str]) -> int:
+    bits = len(data[0])
+    trie = build_trie((int(line, 2) for line in data), bits)
+    oxygen = trie_rating(trie, bits, most=True)
+    co2 = trie_rating(trie, bits, most=False)
+    logging.debug("oxygen=%d co2=%d", oxygen, co2)
+    return oxygen * co2
+
+
+def to_bits(data: list[str]) -> np.ndarray:
+    """One row of 0/1 per line"""
+    text = "".join(data).encode()
+    return (np.frombuffer(text, dtype=np.uint8) - ord("0")).reshape(
+        len(data), -1)
+
+
+MAX_WIDTH = 64      # widest diagnostic whose values fit a uint64
+
+
+def column_weights(width: int) -> np.ndarray:
+    """The place value of each bit column, most significant first"""
+    return np.left_shift(np.uint64(1),
+                         np.arange(width - 1, -1, -1, dtype=np.uint64))
+
+
+def fold_columns(columns: np.ndarray, width: int) -> int:
+    """The number whose set bits are the true entries of columns"""
+    if width <= MAX_WIDTH:
+        return int(column_weights(width)[columns].sum(dtype=np.uint64))
+    return sum(1 << (width - 1 - int(i)) for i in np.flatnonzero(columns))
+
+
+def compute1_numpy(data: list[str]) -> int:
+    bits = to_bits(data)
+    width = bits.shape[1]
+    ones = bits.sum(axis=0, dtype=np.int64)
+    zeros = len(bits) - ones
+    gamma = fold_columns(ones > zeros, width)
+    epsilon = fold_columns(ones < zeros, width)
+    return gamma * epsilon
+
+
+def rating_numpy(values: np.ndarray, bits: int, most: bool) -> int:
+    """trie_rating() over the implicit trie of sorted values: the numbers
+    below a node are the run sharing its prefix"""
+    lo, hi = 0, len(values)
+    prefix = 0
+    for shift in range(bits - 1, -1, -1):
+        # The run splits where the next bit turns to 1
+        mid = lo + int(np.searchsorted(values[lo:hi],
+                                       np.uint64(prefix | (1 << shift))))
+        if choose_bit(mid - lo, hi - mid, most):
+            prefix |= 1 << shift
+            lo = mid
+        else:
+            hi = mid
+    return prefix
+
+
+def compute2_numpy(data: list[str]) -> int:
+    bits = to_bits(data)
+    width = bits.shape[1]
+    if width > MAX_WIDTH:
+        logging.info("%d-bit diagnostics are too wide for uint64: "
+                     "rating them in Python", width)
+        return compute2(data)
+    values = np.sort(bits.astype(np.uint64) @ column_weights(width))
+    return (rating_numpy(values, width, most=True)
+            * rating_numpy(values, width, most=False))
+
+
+def main():
+    namespace = parse_args()
+    text_data = read_data(namespace.input_filename)
+    logging.info("%s", namespace.input_filename)
+    data = parse_data(text_data)
+    if namespace.backend == "numpy":
+        part1, part2 = compute1_numpy, compute2_numpy
+    else:
+        part1, part2 = compute1, compute2
+    result1 = part1(data)
+    print(f"{result1=}")
+    result2 = part2(data)
+    print(f"{result2=}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
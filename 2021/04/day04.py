@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+DAY = 4
+# https://adventofcode.com/2021/day/4
+
+import argparse
+import collections
+import logging
+import os
+from array import array
+from typing import Iterator
+
+SIZE = 5
+
+
+TEST_DATA = f"day{DAY:02}test_input.txt"
+REAL_DATA = f"day{DAY:02}input.txt"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=f"AdventOfCode: Day {DAY}")
+    parser.set_defaults(
+        input_filename=None,
+        real=True,
+        verbose=False,
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--test", "-t", dest="real", action="store_false",
+        help=f"Use {TEST_DATA!r} as input_filename")
+    group.add_argument(
+        "--real", "-r", dest="real", action="store_true",
+        help="Use {REAL_DATA!r} as input_filename")
+
+    parser.add_argument(
+        "--verbose", "-v", action="store_true",
+        help="More verbose logging")
+    namespace = parser.parse_args()
+
+    namespace.input_filename = REAL_DATA if namespace.real else TEST_DATA
+    log_level = logging.DEBUG if namespace.verbose else logging.INFO
+    logging.basicConfig(level=log_level)
+
+    return namespace
+
+
+def read_data(input_filename: str):
+    with open(os.path.join(os.path.dirname(__file__), input_filename)) as f:
+        return f.readlines()
+
+
+def parse_data(text_data: list[str]) -> tuple[list[int], list[list[int]]]:
+    """The draws, and each board as a flat row-major list of SIZE*SIZE"""
+    lines = [line.strip() for line in text_data if line.strip()]
+    numbers = [int(n) for n in lines[0].split(",")]
+    boards = []
+    for i in range(1, len(lines), SIZE):
+        boards.append([int(n) for line in lines[i:i + SIZE]
+                       for n in line.split()])
+    return numbers, boards
+
+
+def build_index(
+        boards: list[list[int]]) -> dict[int, list[tuple[int, int, int]]]:
+    """number -> every (board, row, col) where it appears.
+
+    row and col are offsets into flat per-board hit counters, b * SIZE + r
+    and b * SIZE + c, so the caller need not recompute them per draw.
+    """
+    index: dict[int, list[tuple[int, int, int]]] = collections.defaultdict(
+        list)
+    rows = [i // SIZE for i in range(SIZE * SIZE)]
+    cols = [i % SIZE for i in range(SIZE * SIZE)]
+    for b, board in enumerate(boards):
+        base = b * SIZE
+        for n, r, c in zip(board, rows, cols):
+            index[n].append((b, base + r, base + c))
+    return index
+
+
+def winners(numbers: list[int],
+            boards: list[list[int]]) -> Iterator[tuple[int, int, int]]:
+    """(board, number, score) for each board, in the order they win.
+
+    One pass over the draws: each draw touches only the cells holding it,
+    bumping that board's row and column hit counters, so the total work
+    is O(cells + draws) however many boards there are.
+    """
+    index = build_index(boards)
+    row_hits = array("B", bytes(len(boards) * SIZE))
+    col_hits = array("B", bytes(len(boards) * SIZE))
+    unmarked = array("q", map(sum, boards))
+    won = bytearray(len(boards))
+    called = set()
+    for n in numbers:
+        if n in called:
+            continue
+        called.add(n)
+        for b, r, c in index.get(n, ()):
+            if won[b]:
+                continue
+            unmarked[b] -= n
+            row_hits[r] += 1
+            col_hits[c] += 1
+            if row_hits[r] == SIZE or col_hits[c] == SIZE:
+                won[b] = 1
+                logging.debug("Bingo! board %d: n=%d sum=%d",
+                              b + 1, n, unmarked[b])
+                yield b, n, n * unmarked[b]
+
+
+def compute1(data: tuple[list[int], list[list[int]]]) -> int:
+    numbers, boards = data
+    return next(winners(numbers, boards))[2]
+
+
+def compute2(data: tuple[list[int], list[list[int]]]) -> int:
+    numbers, boards = data
+    *_, last = winners(numbers, boards)
+    return last[2]
+
+
+def main():
+    namespace = parse_args()
+    text_data = read_data(namespace.input_filename)
+    logging.info("%s", namespace.input_filename)
+    data = parse_data(text_data)
+    result1 = compute1(data)
+    print(f"{result1=}")
+    result2 = compute2(data)
+    print(f"{result2=}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,8 +6,18 @@ DAY = 5
 # https://adventofcode.com/2021/day/5#part1
 
 import argparse
+import bisect
+import collections
+import itertools
 import logging
+import math
 import os
+from typing import Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
@@ -30,10 +40,20 @@ def parse_args() -> argparse.Namespace:
         "--real", "-r", dest="real", action="store_true",
         help="Use {REAL_DATA!r} as input_filename")
 
+    parser.add_argument(
+        "--backend", "-B", choices=("python", "numpy"), default="python",
+        help="Implementation to run (default: %(default)s)")
+    parser.add_argument(
+        "--method", "-m", choices=METHODS, default="auto",
+        help="Overlap counting method (default: %(default)s)")
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="More verbose logging")
     namespace = parser.parse_args()
+    if namespace.backend == "numpy" and np is None:
+        parser.error("--backend numpy needs NumPy")
+    if namespace.method == "dense" and np is None:
+        parser.error("--method dense needs NumPy")
 
     namespace.input_filename = REAL_DATA if namespace.real else TEST_DATA
     log_level = logging.DEBUG if namespace.verbose else logging.INFO
@@ -58,41 +78,184 @@ def parse_data(text_data: list[str]) -> list:
     return result
 
 
-def hydrothermal_vents(lines, width: int) -> int:
-    grid = [[0 for _ in range(width)] for _ in range(width)]
+# Each kind of line is a constraint a*x + b*y == key, and a point on it
+# is identified by one parameter: y on vertical lines, x on the others
+HORIZONTAL, VERTICAL, DIAGONAL, ANTIDIAGONAL = range(4)
+FAMILIES = ((0, 1), (1, 0), (-1, 1), (1, 1))
+
+METHODS = ("auto", "sparse", "dense", "analytic")
+
+# The dense rasterizer allocates per point; beyond this, go analytic
+DENSE_MAX_POINTS = 20_000_000
+
+Segment = tuple[int, int, int, int]
+
+
+def segments(lines, diagonals: bool = True) -> list[Segment]:
+    """(family, key, lo, hi) for each straight line; others are ignored"""
+    result = []
     for (x1, y1), (x2, y2) in lines:
-        # print("---")
-        # for r, row in enumerate(grid):
-        #     print(r, row)
-        assert 0 <= x1 < width
-        assert 0 <= y1 < width
-        assert 0 <= x2 < width
-        assert 0 <= y2 < width
-
-        count = 0
-        x_dist = x2 - x1
-        y_dist = y2 - y1
-        x_step = +1 if x_dist > 0 else -1 if x_dist < 0 else 0
-        y_step = +1 if y_dist > 0 else -1 if y_dist < 0 else 0
-        if x_dist == 0:
-            count = abs(y_dist) + 1
-        elif y_dist == 0:
-            count = abs(x_dist) + 1
-        elif abs(x_dist) == abs(y_dist):
-            count = abs(x_dist) + 1
-
-        for i in range(count):
-            grid[y1 + i * y_step][x1 + i * x_step] += 1
-
-    # print("=====\nfinished")
-    total = 0
-    for r, row in enumerate(grid):
-        count = sum(1 if c>=2 else 0 for c in row)
-        # print(r, ": ", count,  "".join([str(c) if c else '.' for c in row]))
-        total += count
+        if y1 == y2:
+            result.append((HORIZONTAL, y1, min(x1, x2), max(x1, x2)))
+        elif x1 == x2:
+            result.append((VERTICAL, x1, min(y1, y2), max(y1, y2)))
+        elif diagonals and abs(x2 - x1) == abs(y2 - y1):
+            if (x2 - x1) == (y2 - y1):
+                result.append((DIAGONAL, y1 - x1, min(x1, x2), max(x1, x2)))
+            else:
+                result.append(
+                    (ANTIDIAGONAL, x1 + y1, min(x1, x2), max(x1, x2)))
+    return result
+
+
+def segment_points(segment: Segment) -> Iterator[tuple[int, int]]:
+    family, key, lo, hi = segment
+    ts = range(lo, hi + 1)
+    if family == HORIZONTAL:
+        return zip(ts, itertools.repeat(key))
+    if family == VERTICAL:
+        return zip(itertools.repeat(key), ts)
+    if family == DIAGONAL:
+        return zip(ts, range(lo + key, hi + key + 1))
+    return zip(ts, range(key - lo, key - hi - 1, -1))
+
+
+def overlaps_sparse(segs: list[Segment]) -> int:
+    """Count every point in a Counter: O(points), whatever the field size"""
+    counts: collections.Counter[tuple[int, int]] = collections.Counter()
+    for segment in segs:
+        counts.update(segment_points(segment))
+    return sum(1 for n in counts.values() if n >= 2)
+
+
+def overlaps_dense(segs: list[Segment]) -> int:
+    """Rasterize every line at once with np.add.at, over the bounding box
+    of only the rows and columns that some point uses"""
+    if not segs:
+        return 0
+    family, key, lo, hi = np.array(segs, dtype=np.int64).T
+    counts = hi - lo + 1
+    # Point k of segment j has parameter lo[j] + k
+    line = np.repeat(np.arange(len(counts)), counts)
+    t = lo[line] + (np.arange(counts.sum())
+                    - np.repeat(np.cumsum(counts) - counts, counts))
+    family, key = family[line], key[line]
+    x = np.where(family == VERTICAL, key, t)
+    y = np.select(
+        [family == HORIZONTAL, family == VERTICAL, family == DIAGONAL],
+        [key, t, t + key], key - t)
+    xs, col = np.unique(x, return_inverse=True)
+    ys, row = np.unique(y, return_inverse=True)
+    grid = np.zeros(len(ys) * len(xs), dtype=np.int32)
+    np.add.at(grid, row * len(xs) + col, 1)
+    return int(np.count_nonzero(grid >= 2))
+
+
+def multiply_covered(segs: list[Segment]) -> dict[tuple[int, int],
+                                                    list[tuple[int, int]]]:
+    """(family, key) -> sorted [start, end) runs that two or more
+    collinear segments cover, by sweeping their endpoints"""
+    events = collections.defaultdict(list)
+    for family, key, lo, hi in segs:
+        events[family, key] += [(lo, 1), (hi + 1, -1)]
+    runs = {}
+    for line, ends in events.items():
+        if len(ends) < 4:
+            continue
+        ends.sort()
+        covered, start, found = 0, 0, []
+        for t, delta in ends:
+            if covered < 2 <= covered + delta:
+                start = t
+            elif covered + delta < 2 <= covered and t > start:
+                found.append((start, t))
+            covered += delta
+        if found:
+            runs[line] = found
+    return runs
+
+
+def crossing(s1: Segment, s2: Segment) -> tuple[int, int] | None:
+    """The lattice point where two segments of different families cross"""
+    (f1, k1, lo1, hi1), (f2, k2, lo2, hi2) = s1, s2
+    (a1, b1), (a2, b2) = FAMILIES[f1], FAMILIES[f2]
+    det = a1 * b2 - a2 * b1
+    x, rx = divmod(k1 * b2 - k2 * b1, det)
+    y, ry = divmod(a1 * k2 - a2 * k1, det)
+    if rx or ry:
+        return None
+    if (lo1 <= (y if f1 == VERTICAL else x) <= hi1
+            and lo2 <= (y if f2 == VERTICAL else x) <= hi2):
+        return x, y
+    return None
+
+
+def overlaps_analytic(segs: list[Segment]) -> int:
+    """Overlaps from segment geometry alone: O(segments^2), independent
+    of line lengths and of the field size.
+
+    Collinear overlaps are runs found by a sweep; every other overlap is
+    a crossing of two families, counted unless a run already holds it.
+    A point in runs of two families is itself such a crossing.
+    """
+    runs = multiply_covered(segs)
+    total = sum(end - start for found in runs.values()
+                for start, end in found)
+    crossings = set()
+    by_family = [[s for s in segs if s[0] == f] for f in range(4)]
+    for f1, f2 in itertools.combinations(range(4), 2):
+        for s1 in by_family[f1]:
+            for s2 in by_family[f2]:
+                point = crossing(s1, s2)
+                if point is not None:
+                    crossings.add(point)
+    for x, y in crossings:
+        # Count each point once, though it may lie in runs of two families
+        in_runs = 0
+        for family, (a, b) in enumerate(FAMILIES):
+            found = runs.get((family, a * x + b * y))
+            if found:
+                t = y if family == VERTICAL else x
+                i = bisect.bisect_right(found, (t, math.inf)) - 1
+                if i >= 0 and found[i][0] <= t < found[i][1]:
+                    in_runs += 1
+        total += 1 - in_runs
     return total
 
 
+def choose_method(segs: list[Segment], dense: bool) -> str:
+    points = sum(hi - lo + 1 for _, _, lo, hi in segs)
+    if points > 2 * len(segs) ** 2:
+        # Long lines: pairs of segments are cheaper than their points
+        return "analytic"
+    if dense and points <= DENSE_MAX_POINTS:
+        return "dense"
+    return "sparse"
+
+
+def overlaps(lines, diagonals: bool = True, method: str = "auto",
+             dense: bool = False) -> int:
+    """How many points at least two lines cover; "auto" picks "dense"
+    only if allowed"""
+    segs = segments(lines, diagonals)
+    if method == "auto":
+        method = choose_method(segs, dense)
+    logging.debug("overlaps: %d segments, method=%s", len(segs), method)
+    return {
+        "sparse": overlaps_sparse,
+        "dense": overlaps_dense,
+        "analytic": overlaps_analytic,
+    }[method](segs)
+
+
+def hydrothermal_vents(lines, diagonals: bool = True) -> int:
+    return overlaps(lines, diagonals)
+
+
+def hydrothermal_vents_numpy(lines, diagonals: bool = True) -> int:
+    return overlaps(lines, diagonals, dense=True)
+
+
 def main():
     namespace = parse_args()
     text_data = read_data(namespace.input_filename)
@@ -100,9 +263,11 @@ def main():
     logging.debug("%s", text_data)
     lines = parse_data(text_data)
     logging.debug("\nlines: %s", lines)
-    overlapped_lines = hydrothermal_vents(
-        lines, 1000 if namespace.real else 10)
-    print(f"Overlap: {overlapped_lines}")
+    dense = namespace.backend == "numpy"
+    result1 = overlaps(lines, False, namespace.method, dense)
+    print(f"{result1=}")
+    result2 = overlaps(lines, True, namespace.method, dense)
+    print(f"{result2=}")
 
 
 if __name__ == "__main__":
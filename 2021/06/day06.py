@@ -31,8 +31,14 @@ def parse_args() -> argparse.Namespace:
         help="Use {REAL_DATA!r} as input_filename")
 
     parser.add_argument(
-        "--num-days", "-n", type=int, default=18,
-        help="Days of simulation")
+        "--num-days", "-n", type=int, nargs="+", default=[18],
+        help="Days of simulation; several share one batched computation")
+    parser.add_argument(
+        "--matrix", "-m", action="store_true",
+        help="Raise the one-day transition matrix to the power num_days")
+    parser.add_argument(
+        "--modulus", "-M", type=int, default=None,
+        help="Count fish modulo this, to make huge --num-days feasible")
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="More verbose logging")
@@ -88,6 +94,78 @@ def simulate_growth2(fish: list[int], num_days: int) -> int:
     return sum(counts)
 
 
+TIMERS = 9
+
+
+def fish_counts(fish: list[int]) -> list[int]:
+    """How many fish have each timer value, 0-8"""
+    counts = [0] * TIMERS
+    for f in fish:
+        counts[f] += 1
+    return counts
+
+
+def transition_matrix() -> list[list[int]]:
+    """One day as a matrix: new_counts[i] = sum(m[i][j] * counts[j])"""
+    m = [[0] * TIMERS for _ in range(TIMERS)]
+    for i in range(TIMERS - 1):
+        m[i][i + 1] = 1
+    m[6][0] = 1     # a parent restarts at 6...
+    m[8][0] = 1     # ...and its child starts at 8
+    return m
+
+
+def mat_mul(a: list[list[int]], b: list[list[int]],
+            modulus: int | None = None) -> list[list[int]]:
+    columns = list(zip(*b))
+    product = [[sum(x * y for x, y in zip(row, col)) for col in columns]
+               for row in a]
+    if modulus:
+        product = [[x % modulus for x in row] for row in product]
+    return product
+
+
+def population_weights(day_counts: list[int],
+                       modulus: int | None = None) -> dict[int, list[int]]:
+    """num_days -> how many fish one fish with each timer becomes.
+
+    The weights are the column sums of M ** num_days. They are built as
+    a row vector times the squarings M, M**2, M**4, ..., which all the
+    day counts share, so each costs O(log num_days) 9x9 products.
+    """
+    weights = {}
+    powers = [transition_matrix()]
+    biggest = max(day_counts, default=0)
+    while (1 << len(powers)) <= biggest:
+        powers.append(mat_mul(powers[-1], powers[-1], modulus))
+    for n in set(day_counts):
+        row = [1] * TIMERS
+        for bit, power in enumerate(powers):
+            if n >> bit & 1:
+                row = mat_mul([row], power, modulus)[0]
+        weights[n] = row
+    return weights
+
+
+def simulate_batch(populations: list[list[int]], day_counts: list[int],
+                   modulus: int | None = None) -> list[list[int]]:
+    """results[p][d]: the size of populations[p] after day_counts[d] days"""
+    weights = population_weights(day_counts, modulus)
+    results = []
+    for fish in populations:
+        counts = fish_counts(fish)
+        sizes = [sum(w * c for w, c in zip(weights[n], counts))
+                 for n in day_counts]
+        results.append([size % modulus for size in sizes] if modulus
+                       else sizes)
+    return results
+
+
+def simulate_growth_matrix(fish: list[int], num_days: int,
+                           modulus: int | None = None) -> int:
+    return simulate_batch([fish], [num_days], modulus)[0][0]
+
+
 def main():
     namespace = parse_args()
     text_data = read_data(namespace.input_filename)
@@ -95,8 +173,16 @@ def main():
     logging.debug("%s", text_data)
     lanternfish = parse_data(text_data)
     logging.debug("\nlanternfish: %s", lanternfish)
-    result = simulate_growth2(lanternfish, namespace.num_days)
-    print(f"Result: {result}")
+    if namespace.matrix or namespace.modulus or len(namespace.num_days) > 1:
+        results = simulate_batch(
+            [lanternfish], namespace.num_days, namespace.modulus)[0]
+    else:
+        results = [simulate_growth2(lanternfish, namespace.num_days[0])]
+    for num_days, result in zip(namespace.num_days, results):
+        if len(results) > 1:
+            print(f"After {num_days} days: {result}")
+        else:
+            print(f"Result: {result}")
 
 
 if __name__ == "__main__":
@@ -6,8 +6,16 @@ DAY = 7
 # https://adventofcode.com/2021/day/7#part1
 
 import argparse
+import bisect
+import itertools
 import logging
 import os
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
@@ -33,10 +41,15 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--target", "-T", type=int,
         help="Target")
+    parser.add_argument(
+        "--backend", "-B", choices=("python", "numpy"), default="python",
+        help="Implementation to run (default: %(default)s)")
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="More verbose logging")
     namespace = parser.parse_args()
+    if namespace.backend == "numpy" and np is None:
+        parser.error("--backend numpy needs NumPy")
 
     namespace.input_filename = REAL_DATA if namespace.real else TEST_DATA
     log_level = logging.DEBUG if namespace.verbose else logging.INFO
@@ -54,31 +67,93 @@ def parse_data(text_data: str) -> list[int]:
     return [int(n.strip()) for n in text_data.split(",")]
 
 
+def prefix_sums(positions: list[int]) -> array:
+    """prefix[k] = sum(positions[:k])"""
+    return array("q", itertools.accumulate(positions, initial=0))
+
+
+def linear_cost(positions: list[int], prefix: array, target: int) -> int:
+    """sum(abs(c - target)) in O(log n): the crabs left of target move
+    right, the rest move left"""
+    n = len(positions)
+    k = bisect.bisect_left(positions, target)
+    return (target * k - prefix[k]
+            + (prefix[n] - prefix[k]) - target * (n - k))
+
+
+def triangular_cost(positions: list[int], prefix: array, sum_squares: int,
+                    target: int) -> int:
+    """sum(sum_to_n(abs(c - target))) in O(log n), as half of the
+    squared distances plus the linear ones"""
+    n = len(positions)
+    squares = sum_squares - 2 * target * prefix[n] + n * target * target
+    return (squares + linear_cost(positions, prefix, target)) // 2
+
+
 def fuel_align(crabs: list[int]) -> int:
-    min_cost = 9999999999
-    seen = set()
-    for target in crabs:
-        if target not in seen:
-            cost = sum(abs(c - target) for c in crabs)
-            seen.add(target)
-            min_cost = min(cost, min_cost)
-    return min_cost
+    # The median minimizes the sum of absolute distances
+    positions = sorted(crabs)
+    median = positions[(len(positions) - 1) // 2]
+    return linear_cost(positions, prefix_sums(positions), median)
 
 
 def sum_to_n(n: int) -> int:
     return n * (n + 1) // 2
 
 
+def mean_candidates(total: int, n: int, lo: int, hi: int) -> range:
+    """The integers that can minimize the triangular cost.
+
+    The real-valued minimum lies within 1/2 of the mean, so the best
+    integer is one of the few around it.
+    """
+    mean = total // n
+    return range(max(lo, mean - 1), min(hi, mean + 2) + 1)
+
+
 def fuel_align2(crabs: list[int]) -> int:
-    min_cost = 9999999999
     positions = sorted(crabs)
-    for target in range(positions[0], positions[-1]+1):
-        # for c in crabs:
-        #     local_cost = sum_to_n(abs(c - target))
-        #     print(f"{target=} {local_cost=}")
-        cost = sum(sum_to_n(abs(c - target)) for c in crabs)
-        min_cost = min(cost, min_cost)
-    return min_cost
+    prefix = prefix_sums(positions)
+    sum_squares = sum(c * c for c in positions)
+    return min(
+        triangular_cost(positions, prefix, sum_squares, target)
+        for target in mean_candidates(
+            prefix[-1], len(positions), positions[0], positions[-1]))
+
+
+def sum_squares_numpy(positions: np.ndarray) -> int:
+    """Exact sum of squares; the total can overflow int64"""
+    squares = (positions * positions).astype(np.uint64)
+    high = int((squares >> np.uint64(32)).sum())
+    low = int((squares & np.uint64(0xFFFFFFFF)).sum())
+    return (high << 32) + low
+
+
+def linear_cost_numpy(positions: np.ndarray, total: int, target: int) -> int:
+    n = len(positions)
+    k = int(np.searchsorted(positions, target))
+    left = int(positions[:k].sum())
+    return target * k - left + (total - left) - target * (n - k)
+
+
+def fuel_align_numpy(crabs: list[int]) -> int:
+    positions = np.sort(np.array(crabs, dtype=np.int64))
+    median = int(positions[(len(positions) - 1) // 2])
+    return linear_cost_numpy(positions, int(positions.sum()), median)
+
+
+def fuel_align2_numpy(crabs: list[int]) -> int:
+    positions = np.sort(np.array(crabs, dtype=np.int64))
+    n = len(positions)
+    total = int(positions.sum())
+    sum_squares = sum_squares_numpy(positions)
+    costs = []
+    for target in mean_candidates(
+            total, n, int(positions[0]), int(positions[-1])):
+        squares = sum_squares - 2 * target * total + n * target * target
+        costs.append(
+            (squares + linear_cost_numpy(positions, total, target)) // 2)
+    return min(costs)
 
 
 def main():
@@ -88,7 +163,10 @@ def main():
     logging.debug("%s", text_data)
     crabs = parse_data(text_data)
     logging.debug("\ncrabs: %s", crabs)
-    result = fuel_align2(crabs)
+    if namespace.backend == "numpy":
+        result = fuel_align2_numpy(crabs)
+    else:
+        result = fuel_align2(crabs)
     print(f"Result: {result}")
 
 
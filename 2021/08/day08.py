@@ -6,8 +6,11 @@ DAY = 8
 # https://adventofcode.com/2021/day/8
 
 import argparse
+import functools
+import itertools
 import logging
 import os
+from typing import Iterable
 
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
@@ -100,8 +103,7 @@ SEGMENTS = {       # count
     9: "abcd.fg",  #     6
 }
 
-SEGMENT_SETS = {k: {c for c in v if c != '.'} for k, v in SEGMENTS.items()}
-SEGMENT_DIGITS = {c: {k for k,v in SEGMENTS.items() if c in v} for c in "abcdefg"}
+SEGMENT_BITS = {c: 1 << i for i, c in enumerate("abcdefg")}
 
 # a: 0.23.56789
 # b: 0...456.89
@@ -128,62 +130,51 @@ def compute1(data) -> int:
     return total
 
 
-def compute2(data) -> int:
-    total = 0
-    for signals, digits in data:
-        fives = []
-        sixes = []
-        one = four = seven = eight = None
-        for s in signals:
-            n = len(s)
-            charset = {c for c in s}
-            if n == 2:
-                # 1: ..c..f.
-                one = charset
-            elif n == 3:
-                # 7: a.c..f.
-                seven = charset
-            elif n == 4:
-                # 4: .bcd.f.
-                four = charset
-            elif n == 5:
-                # 2: a.cde.g
-                # 3: a.cd.fg
-                # 5: ab.d.fg
-                fives.append(charset)
-            elif n == 6:
-                # 0: abc.efg
-                # 6: ab.defg
-                # 9: abcd.fg
-                sixes.append(charset)
-            elif n == 7:
-                # 8: abcdefg
-                eight = charset
-        cf = one
-        a = seven - cf
-        bd = four - cf
-        dg = (fives[0] & fives[1] & fives[2]) - a
-        d = bd & dg
-        b = bd - d
-        g = dg - d
-        bfg = (sixes[0] & sixes[1] & sixes[2]) - a
-        f = cf & bfg
-        c = cf - f
-        e = eight - a - b - c - d - f - g
-        tr = dict(a=a.pop(), b=b.pop(), c=c.pop(), d=d.pop(), e=e.pop(), f=f.pop(), g=g.pop())
-        scrambled_digits = {str(d): {tr[seg] for seg in segs}
-                            for d, segs in SEGMENT_SETS.items()}
-        answer = []
-        for d in digits:
-            charset = {c for c in d}
-            for d2, c2 in scrambled_digits.items():
-                if charset == c2:
-                    answer.append(d2)
-                    break
-        value = int("".join(answer), 10)
-        total += value
+def to_mask(pattern: str) -> int:
+    """A pattern as a 7-bit mask, segment a in bit 0"""
+    return sum(map(SEGMENT_BITS.__getitem__, pattern))
 
-    return total
+
+def signature(masks: Iterable[int]) -> int:
+    """The set of ten masks as one 128-bit int: the same for any order of
+    the patterns, and different for every wiring"""
+    return sum(1 << m for m in masks)
+
+
+@functools.cache
+def wiring_table() -> dict[int, bytes]:
+    """signature -> that wiring's 128-entry mask -> digit array.
+
+    There are 7! = 5040 ways to cross the wires. Unused masks map to 255.
+    """
+    digit_segments = [[ord(c) - ord("a") for c in SEGMENTS[d] if c != "."]
+                      for d in range(10)]
+    table = {}
+    for wires in itertools.permutations(range(7)):
+        digits = bytearray([255]) * 128
+        masks = []
+        for d, segments in enumerate(digit_segments):
+            m = sum(1 << wires[seg] for seg in segments)
+            digits[m] = d
+            masks.append(m)
+        table[signature(masks)] = bytes(digits)
+    return table
+
+
+def decode(signals: list[str], digits: list[str],
+           table: dict[int, bytes]) -> int:
+    """The display's value: one table lookup for the wiring, then one
+    array index per digit"""
+    lookup = table[signature(map(to_mask, signals))]
+    value = 0
+    for d in digits:
+        value = value * 10 + lookup[to_mask(d)]
+    return value
+
+
+def compute2(data) -> int:
+    table = wiring_table()
+    return sum(decode(signals, digits, table) for signals, digits in data)
 
 
 def main():
@@ -6,8 +6,15 @@ DAY = 9
 # https://adventofcode.com/2021/day/9
 
 import argparse
+import heapq
 import logging
+import math
 import os
+import sys
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from aoclib.grid import Grid
 
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
@@ -51,59 +58,84 @@ def read_data(input_filename: str):
         return f.readlines()
 
 
-def parse_data(text_data: list[str]) -> list[str]:
-    results = []
-    for line in text_data:
-        results.append([int(d) for d in line.strip()])
-    return results
+def parse_data(text_data: list[str]) -> Grid:
+    # The border of 9s is both higher than any low point and a basin wall
+    return Grid.from_digits(text_data, border=9)
 
 
-def lowest_points(data) -> int:
-    width = len(data[0])
-    height = len(data)
+def lowest_points(data: Grid) -> list[int]:
+    cells, n4 = data.cells, data.n4
     low_points = []
-    for r, row in enumerate(data):
-        for c, loc in enumerate(row):
-            lowest = True
-            for dx, dy in [(-1, 0), (+1, 0), (0, -1), (0, +1)]:
-                if 0 <= c + dx < width and 0 <= r + dy < height:
-                    if loc >= data[r + dy][c + dx]:
-                        lowest = False
-                        break
-            if lowest:
-                low_points.append((r, c))
+    for i in data.positions():
+        loc = cells[i]
+        for d in n4:
+            if loc >= cells[i + d]:
+                break
+        else:
+            low_points.append(i)
     return low_points
 
 
-def compute1(data) -> int:
-    return sum(1+data[r][c] for r, c in lowest_points(data))
-
-
-def basin_neighbors(data, r, c, seen):
-    if (r, c) in seen:
-        return
-    elif data[r][c] == 9:
-        return
-    seen.add((r, c))
-    width = len(data[0])
-    height = len(data)
-    for dx, dy in [(-1, 0), (+1, 0), (0, -1), (0, +1)]:
-        if 0 <= c + dx < width and 0 <= r + dy < height:
-            basin_neighbors(data, r+dy, c+dx, seen)
-
-
-def compute2(data) -> int:
-    basins = []
-    for r, c in lowest_points(data):
-        seen = set()
-        basin_neighbors(data, r, c, seen)
-        count = len(seen)
-        basins.append(count)
-    largest = sorted(basins)[-3:]
-    n = 1
-    for l in largest:
-        n *= l
-    return n
+def compute1(data: Grid) -> int:
+    return sum(1 + data.cells[i] for i in lowest_points(data))
+
+
+def find(parent: array, label: int) -> int:
+    """The root of label's set, halving the path on the way"""
+    while parent[label] != label:
+        parent[label] = label = parent[parent[label]]
+    return label
+
+
+def survey(data: Grid) -> tuple[int, list[int]]:
+    """The risk level sum of the low points, and the size of every basin.
+
+    One row-by-row pass of connected-component labeling: each non-9 cell
+    takes the label of its left or upper neighbor, and when both have
+    labels, their sets are unioned. Only two rows of labels are kept, so
+    memory beyond the grid is one int per provisional label, and there
+    is no recursion.
+    """
+    cells, stride, n4 = data.cells, data.stride, data.n4
+    parent = array("L", [0])
+    count = array("L", [0])
+    risk = 0
+    above = array("L", [0]) * stride
+    for r in range(data.height):
+        row = array("L", [0]) * stride
+        start = data.index(r, 0)
+        for x in range(1, data.width + 1):
+            i = start + x - 1
+            height = cells[i]
+            if height == 9:
+                continue
+            if all(height < cells[i + d] for d in n4):
+                risk += 1 + height
+            left, up = row[x - 1], above[x]
+            if left and up:
+                left, up = find(parent, left), find(parent, up)
+                if left != up:
+                    parent[max(left, up)] = min(left, up)
+                label = left
+            elif left or up:
+                label = left or up
+            else:
+                label = len(parent)
+                parent.append(label)
+                count.append(0)
+            row[x] = label
+            count[label] += 1
+        above = row
+    sizes: dict[int, int] = {}
+    for label in range(1, len(parent)):
+        root = find(parent, label)
+        sizes[root] = sizes.get(root, 0) + count[label]
+    return risk, list(sizes.values())
+
+
+def compute2(data: Grid) -> int:
+    _, basins = survey(data)
+    return math.prod(heapq.nlargest(3, basins))
 
 
 def main():
@@ -116,9 +148,9 @@ def main():
         logging.debug("%s", text_data)
         data = parse_data(text_data)
     logging.debug("\ndata: %s", data)
-    result1 = compute1(data)
+    result1, basins = survey(data)
     print(f"{result1=}")
-    result2 = compute2(data)
+    result2 = math.prod(heapq.nlargest(3, basins))
     print(f"{result2=}")
 
 
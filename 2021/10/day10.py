@@ -8,6 +8,10 @@ DAY = 10
 import argparse
 import logging
 import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
 
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
@@ -34,6 +38,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--custom", "-C", action="store_true",
         help="Use custom data")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=os.cpu_count(),
+        help="Worker processes (default: %(default)s)")
+    parser.add_argument(
+        "--chunk-size", type=int, default=100_000,
+        help="Lines per worker task (default: %(default)s)")
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="More verbose logging")
@@ -60,37 +70,101 @@ CLOSER = {l: r for l,r in PAIRS}
 OPENER = {r: l for l,r in PAIRS}
 
 
-def compute1(data) -> int:
-    score_values = {")": 3, "]": 57, "}": 1197, ">": 25137}
+CORRUPT_POINTS = {")": 3, "]": 57, "}": 1197, ">": 25137}
+# Completing an opener scores its closer's points
+COMPLETE_POINTS = {"(": 1, "[": 2, "{": 3, "<": 4}
+
+ChunkResult = tuple[int, list[int], int, float]
+
+
+def score_line(line: str) -> tuple[int, int | None]:
+    """(corruption score, completion score) in one scan of the line.
+
+    A corrupted line has no completion score (None); any other line
+    scores 0 for corruption.
+    """
+    stack = []
+    push, pop = stack.append, stack.pop
+    for c in line:
+        if c in CLOSER:
+            push(c)
+        elif not stack or pop() != OPENER[c]:
+            return CORRUPT_POINTS[c], None
+    score = 0
+    for c in reversed(stack):
+        score = score * 5 + COMPLETE_POINTS[c]
+    return 0, score
+
+
+def score_chunk(lines: list[str]) -> ChunkResult:
+    """(corruption total, completion scores, lines, seconds) for a chunk"""
+    start = time.perf_counter()
     total = 0
-    for line in data:
-        stack = []
-        for c in line:
-            if c in CLOSER:
-                stack.append(c)
-            elif stack.pop() != OPENER[c]:
-                total += score_values[c]
-                break
-    return total
+    scores = []
+    for line in lines:
+        corrupt, complete = score_line(line)
+        total += corrupt
+        if complete is not None:
+            scores.append(complete)
+    return total, scores, len(lines), time.perf_counter() - start
+
+
+def chunks(data: list[str], chunk_size: int) -> Iterator[list[str]]:
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+
+
+def score_lines(data: list[str], jobs: int = 1,
+                chunk_size: int = 100_000) -> tuple[int, list[int]]:
+    """Score every line, in chunks spread over jobs worker processes"""
+    start = time.perf_counter()
+    if jobs > 1 and len(data) > chunk_size:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(score_chunk,
+                                        chunks(data, chunk_size)))
+    else:
+        jobs = 1
+        results = [score_chunk(data)]
+    seconds = time.perf_counter() - start
+    total = 0
+    scores = []
+    for i, (chunk_total, chunk_scores, count, busy) in enumerate(results):
+        total += chunk_total
+        scores += chunk_scores
+        logging.debug("chunk %d: %d lines in %.3fs, %.0f lines/s",
+                      i, count, busy, count / busy if busy else 0)
+    logging.info("%d lines in %d chunks on %d workers: %.3fs, %.0f lines/s",
+                 len(data), len(results), jobs, seconds,
+                 len(data) / seconds if seconds else 0)
+    return total, scores
+
+
+def select(values: list[int], k: int) -> int:
+    """The k-th smallest value, by quickselect: expected O(n)"""
+    while True:
+        pivot = random.choice(values)
+        lower = [v for v in values if v < pivot]
+        if k < len(lower):
+            values = lower
+            continue
+        k -= len(lower)
+        equal = values.count(pivot)
+        if k < equal:
+            return pivot
+        k -= equal
+        values = [v for v in values if v > pivot]
+
+
+def middle_score(scores: list[int]) -> int:
+    return select(scores, len(scores) // 2)
+
+
+def compute1(data) -> int:
+    return score_lines(data)[0]
 
 
 def compute2(data) -> int:
-    score_values = {")": 1, "]": 2, "}": 3, ">": 4}
-    scores = []
-    for line in data:
-        stack = []
-        score = 0
-        for c in line:
-            if c in CLOSER:
-                stack.append(c)
-            elif stack.pop() != OPENER[c]:
-                break
-        else:
-            while len(stack) > 0:
-                c = CLOSER[stack.pop()]
-                score = score * 5 + score_values[c]
-            scores.append(score)
-    return sorted(scores)[len(scores) // 2]
+    return middle_score(score_lines(data)[1])
 
 
 def main():
@@ -103,9 +177,9 @@ def main():
         logging.debug("%s", text_data)
         data = parse_data(text_data)
     logging.debug("\ndata: %s", data)
-    result1 = compute1(data)
+    result1, scores = score_lines(data, namespace.jobs, namespace.chunk_size)
     print(f"{result1=}")
-    result2 = compute2(data)
+    result2 = middle_score(scores)
     print(f"{result2=}")
 
 
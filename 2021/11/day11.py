@@ -6,8 +6,21 @@ DAY = 11
 # https://adventofcode.com/2021/day/11
 
 import argparse
+import itertools
 import logging
 import os
+import sys
+from typing import Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from aoclib import trace
+from aoclib.cache import cache_payload
+from aoclib.grid import Grid
 
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
@@ -33,18 +46,25 @@ def parse_args() -> argparse.Namespace:
 
     parser.add_argument(
         "--steps", "-s", type=int,
-        help="Number of steps")
+        help="Stop after this many steps (default: until they synchronize)")
     parser.add_argument(
         "--custom", "-C", action="store_true",
         help="Use custom data")
+    parser.add_argument(
+        "--backend", "-B", choices=("python", "numpy"), default="python",
+        help="Implementation to run (default: %(default)s)")
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="More verbose logging")
     namespace = parser.parse_args()
+    if namespace.backend == "numpy" and np is None:
+        parser.error("--backend numpy needs NumPy")
 
     namespace.input_filename = REAL_DATA if namespace.real else TEST_DATA
     log_level = logging.DEBUG if namespace.verbose else logging.INFO
     logging.basicConfig(level=log_level)
+    if namespace.verbose:
+        trace.enable()
 
     return namespace
 
@@ -54,12 +74,12 @@ def read_data(input_filename: str):
         return f.readlines()
 
 
-def parse_data(text_data: list[str]) -> list[list[int]]:
-    return [[int(d) for d in line.strip()]
-            for line in text_data]
+def parse_data(text_data: list[str]) -> Grid:
+    return Grid.from_digits(text_data, border=BORDER)
 
 
-def load_data(namespace) -> list[list[int]]:
+@cache_payload
+def load_data(namespace) -> Grid:
     if namespace.custom:
         text_data = ["-1"]
         data = parse_data(text_data)
@@ -76,63 +96,128 @@ def grid_to_str(grid: list[list[int]], prefix="") -> str:
         "".join([str(n) for n in row]) for row in grid) + "\n"
 
 
-def update_grid(grid: list[list[int]], r: int, c: int) -> int:
-    grid[r][c] += 1
-    if grid[r][c] != 10:
-        return 0
-
-    flashes = 1
-    width, height = len(grid[0]), len(grid)
-    for r2 in (r-1, r, r+1):
-        if 0 <= r2 < height:
-            for c2 in (c-1, c, c+1):
-                if r != r2 or c != c2:
-                    if 0 <= c2 < width:
-                        flashes += update_grid(grid, r2, c2)
-    return flashes
-
-
-def compute1(grid: list[list[int]], steps: int) -> int:
-    total = 0
-    width, height = len(grid[0]), len(grid)
-    # print(grid_to_str(grid))
-    for step in range(1, steps + 1):
-        flashes = 0
-        for r in range(height):
-            for c in range(width):
-                flashes += update_grid(grid, r, c)
-        for r in range(height):
-            for c in range(width):
-                if grid[r][c] > 9:
-                    grid[r][c] = 0
-        # print(f"\n{step=}: {rounds=} {flashes=}")
-        # print(grid_to_str(grid))
-        total += flashes
-    return total
-
-
-def compute2(grid: list[list[int]], steps: int) -> int:
-    width, height = len(grid[0]), len(grid)
-    for step in range(1, steps + 1):
-        flashes = 0
-        for r in range(height):
-            for c in range(width):
-                flashes += update_grid(grid, r, c)
-        for r in range(height):
-            for c in range(width):
-                if grid[r][c] > 9:
-                    grid[r][c] = 0
-        if flashes == width * height:
-            return step
-    return -1
+# Never incremented, so it can never flash
+BORDER = 255
+
+# Add 1 to every energy level, leaving the border alone
+INCREMENT = bytes(range(1, 255)) + bytes([255, BORDER])
+# Reset every cell that flashed (above 9) to 0
+RESET = bytes(v if v <= 9 or v == BORDER else 0 for v in range(256))
+
+
+def flashes(grid: Grid) -> Iterator[int]:
+    """Step the grid in place, yielding the number of flashes per step.
+
+    The increment and the reset are bytes.translate() over the whole
+    buffer. Flashes spread through a worklist, touching only the
+    neighbors of cells that flash.
+    """
+    cells, n8 = grid.cells, grid.n8
+    while True:
+        cells[:] = cells.translate(INCREMENT)
+        pending = []
+        i = cells.find(10)
+        while i != -1:
+            pending.append(i)
+            i = cells.find(10, i + 1)
+        count = 0
+        while pending:
+            i = pending.pop()
+            count += 1
+            for d in n8:
+                j = i + d
+                # Skips the border and the cells that already flashed
+                v = cells[j]
+                if v < 10:
+                    cells[j] = v + 1
+                    if v == 9:
+                        pending.append(j)
+        cells[:] = cells.translate(RESET)
+        yield count
+
+
+def cycle_length(grid: Grid, steps: Iterator[int]) -> int:
+    """Steps until the grid's current state recurs; it must be on a cycle"""
+    start = bytes(grid.cells)
+    for n, _ in enumerate(steps, 1):
+        if grid.cells == start:
+            return n
+
+
+def find_sync(grid: Grid, steps: Iterator[int],
+              max_steps: int | None = None) -> tuple[int, int]:
+    """(first step on which every octopus flashes, period from then on).
+
+    The step is -1 if the grid never synchronizes within max_steps, or
+    falls into a cycle without ever synchronizing, which Brent's method
+    detects from one saved state.
+    """
+    everyone = grid.width * grid.height
+    cells = grid.cells
+    saved, saved_step, power = bytes(cells), 0, 1
+    for step, count in enumerate(steps, 1):
+        if trace.enabled:
+            trace.event("step %d: %d flashes", step, count)
+        if count == everyone:
+            return step, cycle_length(grid, steps)
+        if cells == saved:
+            return -1, step - saved_step
+        if step - saved_step == power:
+            saved, saved_step, power = bytes(cells), step, 2 * power
+        if max_steps is not None and step >= max_steps:
+            break
+    return -1, 0
+
+
+def compute1(grid: Grid, steps: int = 100) -> int:
+    return sum(itertools.islice(flashes(grid), steps))
+
+
+def compute2(grid: Grid, steps: int | None = None) -> int:
+    return find_sync(grid, flashes(grid), steps)[0]
+
+
+def flashes_numpy(grid: Grid) -> Iterator[int]:
+    """flashes(), as repeated masked neighbor sums over a view of the
+    grid's own buffer"""
+    energy = grid.to_numpy()
+    while True:
+        energy += 1
+        flashed = np.zeros(energy.shape, dtype=bool)
+        new = energy > 9
+        while new.any():
+            flashed |= new
+            # Each new flash adds 1 to its 8 neighbors
+            p = np.pad(new, 1).astype(np.uint8)
+            energy += (p[:-2, :-2] + p[:-2, 1:-1] + p[:-2, 2:]
+                       + p[1:-1, :-2] + p[1:-1, 2:]
+                       + p[2:, :-2] + p[2:, 1:-1] + p[2:, 2:])
+            new = (energy > 9) & ~flashed
+        energy[flashed] = 0
+        yield int(np.count_nonzero(flashed))
+
+
+def compute1_numpy(grid: Grid, steps: int = 100) -> int:
+    return sum(itertools.islice(flashes_numpy(grid), steps))
+
+
+def compute2_numpy(grid: Grid, steps: int | None = None) -> int:
+    return find_sync(grid, flashes_numpy(grid), steps)[0]
 
 
 def main():
     namespace = parse_args()
-    result1 = compute1(load_data(namespace), min(100, namespace.steps))
+    if namespace.backend == "numpy":
+        part1, steps = compute1_numpy, flashes_numpy
+    else:
+        part1, steps = compute1, flashes
+    result1 = part1(load_data(namespace), min(100, namespace.steps or 100))
     print(f"{result1=}")
-    result2 = compute2(load_data(namespace), namespace.steps)
+    grid = load_data(namespace)
+    result2, period = find_sync(grid, steps(grid), namespace.steps)
     print(f"{result2=}")
+    if period:
+        logging.info("The state recurs every %d steps", period)
 
 
 if __name__ == "__main__":
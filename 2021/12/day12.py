@@ -8,8 +8,14 @@ DAY = 12
 # https://adventofcode.com/2021/day/12
 
 import argparse
+import functools
 import logging
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from aoclib import trace
+from aoclib.cache import cache_payload
 
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
@@ -39,6 +45,9 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--custom", "-C", type=int,
             help="Use custom data")
+    parser.add_argument(
+        "--paths", "-p", action="store_true",
+        help="List every part 2 path; there may be billions")
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="More verbose logging")
@@ -50,6 +59,8 @@ def parse_args() -> argparse.Namespace:
         namespace.input_filename = REAL_DATA if namespace.real else TEST_DATA
     log_level = logging.DEBUG if namespace.verbose else logging.INFO
     logging.basicConfig(level=log_level)
+    if namespace.verbose:
+        trace.enable()
 
     return namespace
 
@@ -68,6 +79,7 @@ def parse_data(text_data: list[str]) -> dict[str, list[str]]:
     return pairs
 
 
+@cache_payload
 def load_data(namespace) -> list[list[int]]:
     text_data = read_data(namespace.input_filename)
     logging.info("%s", namespace.input_filename)
@@ -77,9 +89,12 @@ def load_data(namespace) -> list[list[int]]:
 
 
 def explore1(node: str, pairs: dict[str, list[str]], seen: set[str], path: list[str]):
-    logging.debug(f"explore1: {path=} {node=} {seen=} caves={pairs[node]}")
+    if trace.enabled:
+        trace.event("explore1: path=%s node=%s seen=%s caves=%s",
+                    path, node, seen, pairs[node])
     if node == "end":
-        logging.debug(f"\tPath: {path}")
+        if trace.enabled:
+            trace.event("\tPath: %s", path)
         yield path
     else:
         for cave in pairs[node]:
@@ -89,21 +104,24 @@ def explore1(node: str, pairs: dict[str, list[str]], seen: set[str], path: list[
 
 
 def compute1(pairs: dict[str, list[str]]) -> int:
-    paths = [path for path in explore1("start", pairs, set(), ["start"])]
-    for path in paths:
-        logging.debug(f'{",".join(path)}')
-    return len(paths)
+    if trace.enabled:
+        for path in explore1("start", pairs, set(), ["start"]):
+            trace.event("%s", ",".join(path))
+    return count_paths(pairs, revisit=False)
 
 
 def explore2(node: str, pairs: dict[str, list[str]], seen: dict[str, int], path: list[str]):
     if node == "end":
-        logging.debug(f"\tPath: {path}")
+        if trace.enabled:
+            trace.event("\tPath: %s", path)
         yield path
     else:
         seen = seen.copy()
         if node.islower():
             seen[node] += 1
-        logging.debug(f"explore2: path={','.join(path)} {node=} {seen=} caves={pairs[node]}")
+        if trace.enabled:
+            trace.event("explore2: path=%s node=%s seen=%s caves=%s",
+                        ",".join(path), node, dict(seen), pairs[node])
         for cave in set(pairs[node]) - {"start"}:
             prev = seen[cave]
             if prev == 2 or (prev == 1 and any(v == 2 for v in seen.values())):
@@ -112,14 +130,109 @@ def explore2(node: str, pairs: dict[str, list[str]], seen: dict[str, int], path:
 
 
 def compute2(pairs: dict[str, list[str]]) -> int:
-    paths = [path for path in explore2("start", pairs, defaultdict(int), ["start"])]
-    for path in paths:
-        logging.debug(f'{",".join(path)}')
-    return len(paths)
+    if trace.enabled:
+        for path in explore2("start", pairs, defaultdict(int), ["start"]):
+            trace.event("%s", ",".join(path))
+    return count_paths(pairs, revisit=True)
+
+
+def small_cave_graph(
+        pairs: dict[str, list[str]]) -> list[list[tuple[int, int]]]:
+    """Small caves interned as 0 (start), 1 (end), 2, ...; edges[i] is
+    [(j, ways)], where ways counts the direct tunnel plus the routes
+    through one big cave in between.
+
+    Two big caves are never adjacent, or there would be infinitely many
+    paths, so a path only ever passes straight through a big cave.
+    """
+    small = ["start", "end"] + sorted(
+        cave for cave in pairs
+        if cave.islower() and cave not in ("start", "end"))
+    ids = {cave: i for i, cave in enumerate(small)}
+    edges = []
+    for cave in small:
+        ways: dict[int, int] = defaultdict(int)
+        for neighbor in pairs[cave]:
+            hops = [neighbor] if neighbor in ids else pairs[neighbor]
+            for hop in hops:
+                # Never return to start
+                if hop != "start":
+                    ways[ids[hop]] += 1
+        edges.append(list(ways.items()))
+    return edges
+
+
+def neighbor_masks(adjacent: list[int], caves: int) -> int:
+    """The union of adjacent[cave] for the caves in the bitmask"""
+    neighbors = 0
+    while caves:
+        low = caves & -caves
+        neighbors |= adjacent[low.bit_length() - 1]
+        caves ^= low
+    return neighbors
+
+
+def count_paths(pairs: dict[str, list[str]], revisit: bool) -> int:
+    """How many paths lead from start to end, without listing them.
+
+    The visited small caves are a bitmask, and the count from a state
+    (cave, visited, revisit) is memoized. Only the caves that the rest
+    of a path could still reach affect that count, so visited caves
+    outside them are dropped from the key, which lets many states share
+    one entry. A state that cannot reach end at all is 0 at once. With
+    revisit, one small cave may be entered a second time.
+    """
+    if "start" not in pairs:
+        return 0
+    edges = small_cave_graph(pairs)
+    adjacent = [sum(1 << cave for cave, _ in ways) for ways in edges]
+    END = 1
+    everything = (1 << len(edges)) - 1
+
+    def spread(reach: int, allowed: int) -> int:
+        """reach, grown through the allowed caves"""
+        frontier = reach
+        while frontier:
+            frontier = neighbor_masks(adjacent, frontier) & allowed & ~reach
+            reach |= frontier
+        return reach
+
+    @functools.cache
+    def count(cave: int, visited: int, revisit: bool) -> int:
+        if cave == END:
+            return 1
+        unvisited = everything & ~visited
+        reach = spread(1 << cave, unvisited)
+        if revisit:
+            # One visited neighbor may be crossed, then unvisited caves
+            reach = spread(reach | neighbor_masks(adjacent, reach), unvisited)
+        if not reach >> END & 1:
+            return 0
+        return count_within(cave, visited & reach, reach, revisit)
+
+    @functools.cache
+    def count_within(cave: int, visited: int, reach: int,
+                     revisit: bool) -> int:
+        # Caves out of reach count as visited
+        visited |= everything & ~reach
+        total = 0
+        for neighbor, ways in edges[cave]:
+            bit = 1 << neighbor
+            if not visited & bit:
+                total += ways * count(neighbor, visited | bit, revisit)
+            elif revisit:
+                total += ways * count(neighbor, visited, False)
+        return total
+
+    return count(0, 1, revisit)
 
 
 def main():
     namespace = parse_args()
+    if namespace.paths:
+        pairs = load_data(namespace)
+        for path in explore2("start", pairs, defaultdict(int), ["start"]):
+            print(",".join(path))
     result1 = compute1(load_data(namespace))
     print(f"{result1=}")
     result2 = compute2(load_data(namespace))
@@ -8,6 +8,7 @@ DAY = 13
 import argparse
 import logging
 import os
+from typing import Iterable
 
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
@@ -87,61 +88,89 @@ def load_data(namespace) -> list[list[int]]:
     return data
 
 
-def grid_to_str(grid: list[list[int]], width, height, prefix="") -> str:
-    return prefix + ("\n" + prefix).join(
-        "".join([str(n) for n in row[:width]])
-            for row in grid[:height]) + "\n"
+DOT = ord("#")
 
+# A dot (x, y) is packed as y << SHIFT | x
+SHIFT = 32
 
-def fold(dots, folds):
-    width = height = 0
-    for x, y in dots:
-        width = max(width, x + 1)
-        height = max(height, y + 1)
-    grid = [["." for _ in range(width)] for _ in range(height)]
-    for x, y in dots:
-        grid[y][x] = "#"
-    logging.debug(grid_to_str(grid, width, height))
-    for axis, line in folds:
-        logging.debug(f"{axis=} {line=} {width=} {height=}")
-        if axis == "x":
-            for x1 in range(line+1, width):
-                for y in range(height):
-                    if grid[y][x1] == "#":
-                        grid[y][2 * line - x1] = "#"
-            width = line
-        elif axis == "y":
-            for y1 in range(line+1, height):
-                for x in range(width):
-                    if grid[y1][x] == "#":
-                        grid[2 * line - y1][x] = "#"
-            height = line
-        else:
+
+def reflect(value: int, lines: list[int]) -> int | None:
+    """Where value lands after folding along each line in turn, or None
+    if it falls on a fold line or off the paper"""
+    for line in lines:
+        if value == line:
+            return None
+        value = line - abs(value - line)
+    return value if value >= 0 else None
+
+
+def axis_map(values: Iterable[int], lines: list[int]) -> dict[int, int | None]:
+    """All the folds along one axis, composed into one lookup, computed
+    once per distinct coordinate"""
+    return {value: reflect(value, lines) for value in set(values)}
+
+
+def fold(dots, folds) -> tuple[set[int], set[int], int, int]:
+    """(packed dots after the first fold, packed dots after all folds,
+    final width, final height), mapping every dot once.
+
+    Folds along x never move y, and vice versa, so each axis's folds
+    compose independently of the other's.
+    """
+    xs = [x for x, _ in dots]
+    ys = [y for _, y in dots]
+    x_lines = [line for axis, line in folds if axis == "x"]
+    y_lines = [line for axis, line in folds if axis == "y"]
+    for axis, _ in folds:
+        if axis not in ("x", "y"):
             raise ValueError(f"Unknown {axis=}")
-        logging.debug(grid_to_str(grid, width, height))
-    return grid, width, height
+    final_x, final_y = axis_map(xs, x_lines), axis_map(ys, y_lines)
+    first_axis, first_line = folds[0] if folds else ("x", None)
+    lines = [first_line] if first_line is not None else []
+    first_x = axis_map(xs, lines if first_axis == "x" else [])
+    first_y = axis_map(ys, lines if first_axis == "y" else [])
+
+    first, final = set(), set()
+    for x, y in dots:
+        x1, y1 = first_x[x], first_y[y]
+        if x1 is not None and y1 is not None:
+            first.add(y1 << SHIFT | x1)
+        x2, y2 = final_x[x], final_y[y]
+        if x2 is not None and y2 is not None:
+            final.add(y2 << SHIFT | x2)
+    width = x_lines[-1] if x_lines else max(xs, default=-1) + 1
+    height = y_lines[-1] if y_lines else max(ys, default=-1) + 1
+    logging.debug("len(first)=%d len(final)=%d width=%d height=%d",
+                  len(first), len(final), width, height)
+    return first, final, width, height
+
+
+def render(dots: set[int], width: int, height: int) -> str:
+    rows = [bytearray(b".") * width for _ in range(height)]
+    mask = (1 << SHIFT) - 1
+    for dot in dots:
+        rows[dot >> SHIFT][dot & mask] = DOT
+    return "".join(row.decode() + "\n" for row in rows)
 
 
 def compute1(dots, folds) -> int:
-    grid, width, height = fold(dots, folds[:1])
-    total = sum(
-        1 if grid[y][x] == "#" else 0
-            for y in range(height)
-                for x in range(width))
-    return total
+    first, _, _, _ = fold(dots, folds)
+    return len(first)
 
 
 def compute2(dots, folds):
-    grid, width, height = fold(dots, folds)
-    print(grid_to_str(grid, width, height))
-    return grid
+    _, final, width, height = fold(dots, folds)
+    code = render(final, width, height)
+    print(code)
+    return code
 
 
 def main():
     namespace = parse_args()
-    result1 = compute1(*load_data(namespace))
+    first, final, width, height = fold(*load_data(namespace))
+    result1 = len(first)
     print(f"{result1=}")
-    compute2(*load_data(namespace))
+    print(render(final, width, height))
 
 
 if __name__ == "__main__":
@@ -7,10 +7,15 @@ DAY = 14
 
 import argparse
 import logging
+import operator
 import os
+import sys
 
 from collections import Counter
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from aoclib.cache import cache_payload
+
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
 REAL_DATA = f"day{DAY:02}input.txt"
@@ -35,7 +40,14 @@ def parse_args() -> argparse.Namespace:
 
     parser.add_argument(
         "--steps", "-s", type=int,
-        help="Number of steps")
+        help="Number of steps (default: 10 for part 1 and 40 for part 2)")
+    parser.add_argument(
+        "--method", "-m", choices=METHODS, default="step",
+        help="Count pairs step by step, or by matrix power "
+             "(default: %(default)s)")
+    parser.add_argument(
+        "--modulus", "-M", type=int, default=None,
+        help="Show the element counts modulo this, for huge --steps")
     parser.add_argument(
         "--custom", "-C", action="store_true",
         help="Use custom data")
@@ -68,6 +80,7 @@ def parse_data(text_data: list[str]) -> tuple[list[str], dict[str, str]]:
     return template, rules
 
 
+@cache_payload
 def load_data(namespace) -> list[list[int]]:
     if namespace.custom:
         text_data = ["-1"]
@@ -80,87 +93,139 @@ def load_data(namespace) -> list[list[int]]:
     return data
 
 
+METHODS = ("step", "matrix")
+
+
+def pair_transitions(template: list[str], rules: dict[str, tuple[str, str]]
+                     ) -> tuple[list[str], list[tuple[int, ...]]]:
+    """Every pair, and for pair i, the indices of the pairs it becomes.
+
+    A pair with no rule (none in the puzzle inputs) stays as it is.
+    """
+    pairs = set(rules)
+    pairs.update(p for made in rules.values() for p in made)
+    pairs.update(a + b for a, b in zip(template, template[1:]))
+    pairs = sorted(pairs)
+    index = {pair: i for i, pair in enumerate(pairs)}
+    targets = [tuple(index[p] for p in rules[pair]) if pair in rules
+               else (i,) for i, pair in enumerate(pairs)]
+    return pairs, targets
+
+
+def initial_counts(template: list[str], pairs: list[str]) -> list[int]:
+    index = {pair: i for i, pair in enumerate(pairs)}
+    counts = [0] * len(pairs)
+    for a, b in zip(template, template[1:]):
+        counts[index[a + b]] += 1
+    return counts
+
+
+def step_counts(counts: list[int], targets: list[tuple[int, ...]],
+                steps: int, modulus: int | None = None) -> list[int]:
+    """Pair counts after steps, one sparse pass per step"""
+    for step in range(steps):
+        new_counts = [0] * len(counts)
+        for count, made in zip(counts, targets):
+            if count:
+                for j in made:
+                    new_counts[j] += count
+        if modulus:
+            new_counts = [c % modulus for c in new_counts]
+        counts = new_counts
+    return counts
+
+
+def mat_mul(a: list[list[int]], b: list[list[int]],
+            modulus: int | None = None) -> list[list[int]]:
+    columns = list(zip(*b))
+    product = [[sum(map(operator.mul, row, col)) for col in columns]
+               for row in a]
+    if modulus:
+        product = [[x % modulus for x in row] for row in product]
+    return product
+
+
+def matrix_counts(counts: list[int], targets: list[tuple[int, ...]],
+                  steps: int, modulus: int | None = None) -> list[int]:
+    """Pair counts after steps, as counts times the transition matrix to
+    the power steps, by repeated squaring: O(log steps) products"""
+    n = len(counts)
+    power = [[0] * n for _ in range(n)]
+    for i, made in enumerate(targets):
+        for j in made:
+            power[i][j] += 1
+    row = [counts]
+    while steps:
+        if steps & 1:
+            row = mat_mul(row, power, modulus)
+        steps >>= 1
+        if steps:
+            power = mat_mul(power, power, modulus)
+    return row[0]
+
+
+def element_counts(template: list[str], rules: dict[str, tuple[str, str]],
+                   steps: int, method: str = "step",
+                   modulus: int | None = None) -> dict[str, int]:
+    """How often each element occurs in the polymer after steps.
+
+    Each element is the first of exactly one pair, except the last,
+    which never changes, so the pair counts plus the template's last
+    element give every count.
+    """
+    if not template:
+        return {}
+    pairs, targets = pair_transitions(template, rules)
+    counts = initial_counts(template, pairs)
+    evolve = matrix_counts if method == "matrix" else step_counts
+    counts = evolve(counts, targets, steps, modulus)
+    elements = {template[-1]: 1}
+    for pair, count in zip(pairs, counts):
+        elements[pair[0]] = elements.get(pair[0], 0) + count
+    if modulus:
+        elements = {e: count % modulus for e, count in elements.items()}
+    logging.debug("steps=%d: elements=%s", steps, elements)
+    return elements
+
+
+def polymer_strength(template, rules, steps, method="step") -> int:
+    """The most common element's count minus the least common's.
+
+    Elements that only appear in the rules have a count of 0 and are not
+    in the polymer, so they are left out of the ranking.
+    """
+    counts = element_counts(template, rules, steps, method)
+    frequency = sorted(count for count in counts.values() if count)
+    return frequency[-1] - frequency[0] if frequency else 0
+
+
 def compute1(template, rules, steps) -> int:
-    polymer = template
-    for step in range(1, steps+1):
-        new_polymer = []
-        new_pairs = []
-        pair_counts = {}
-        for i in range(len(polymer) - 1):
-            pair = polymer[i] + polymer[i+1]
-            pair0, pair1 = rules[pair]
-            new_polymer.append(pair0[0])
-            new_polymer.append(pair0[1])
-
-            pair_counts[pair0] = pair_counts.get(pair0, 0) + 1
-            pair_counts[pair1] = pair_counts.get(pair1, 0) + 1
-            new_pairs.extend([pair0, pair1])
-        new_polymer.append(polymer[-1])
-        logging.debug(f"{step=}: {''.join(polymer)} -> {''.join(new_polymer)}")
-        logging.debug(f"{step=}: {''.join(new_polymer)} -> {pair_counts=} {new_pairs=}")
-        logging.debug(f"{step=}: {len(new_polymer)}")
-        polymer = new_polymer
-    
-    elements = {c for pairs in rules for c in pairs}
-    counts = {c: polymer.count(c) for c in elements}
-    frequency = sorted(counts.values())
-    print(''.join(polymer))
-    print(f"#polymer={len(polymer)} {counts=} {frequency=}")
-
-    return frequency[-1] - frequency[0]
+    return polymer_strength(template, rules, steps)
 
 
 def compute2(template, rules, steps) -> int:
-    # Nope. See mapleoctopus21.py
-    print("\ncompute2")
-    pairs = {}
-    polymer = template
-    for i in range(0, len(template) - 1):
-        pair = template[i] + template[i + 1]
-        increment = +1 # if i % 2 == 0 else -1
-        pairs[pair] = pairs.get(pair, 0) + increment
-    logging.debug(f"step=0: {pairs=}")
-
-    for step in range(1, steps+1):
-        new_polymer = []
-        for i in range(len(polymer) - 1):
-            pair = polymer[i] + polymer[i+1]
-            pair0, _ = rules[pair]
-            new_polymer.append(pair0[0])
-            new_polymer.append(pair0[1])
-        new_polymer.append(polymer[-1])
-        polymer = new_polymer
-
-        # new_pairs = {}
-        new_pairs = pairs.copy()
-        for pair in pairs:
-            pair0, pair1 = rules[pair]
-            if pair0 != pair and pair1 != pair:
-                new_pairs[pair] = max(new_pairs[pair] - 1, 0)
-            t0 = new_pairs[pair0] = pairs.get(pair0, 0) + 1
-            t1 = new_pairs[pair1] = pairs.get(pair1, 0) + 1
-            print(f"{pair=} -> {pair0=} {t0=}, {pair1=} {t1=}")
-        pairs = new_pairs
-        logging.debug(f"{step=}: {''.join(polymer)} {pairs=}")
-
-    counts = {template[-1]: 1}
-
-    for pair, count in pairs.items():
-        print(f"\t{pair[0]}{pair[1]}: {pairs[pair]}")
-        counts[pair[0]] = counts.get(pair[0], 0) + count
-        counts[pair[1]] = counts.get(pair[1], 0) + count
-    print(sum(pairs.values()))
-    frequency = sorted(counts.values())
-    print(f"{counts=} {frequency=}")
-
-    return frequency[-1] - frequency[0]
+    # The parts differ only in steps, which solve.py passes: 10 and 40
+    return compute1(template, rules, steps)
 
 
 def main():
     namespace = parse_args()
-    result1 = compute1(*load_data(namespace), namespace.steps)
+    template, rules = load_data(namespace)
+    if namespace.modulus:
+        # Counts mod M cannot be ranked, so show them all
+        steps = namespace.steps or 40
+        counts = element_counts(template, rules, steps, namespace.method,
+                                namespace.modulus)
+        print(f"{steps=}: {counts=}")
+        return
+    if namespace.steps:
+        result = polymer_strength(
+            template, rules, namespace.steps, namespace.method)
+        print(f"{result=}")
+        return
+    result1 = polymer_strength(template, rules, 10, namespace.method)
     print(f"{result1=}")
-    result2 = compute2(*load_data(namespace), namespace.steps)
+    result2 = polymer_strength(template, rules, 40, namespace.method)
     print(f"{result2=}")
 
 
@@ -8,6 +8,11 @@ DAY = 15
 import argparse
 import logging
 import os
+import sys
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from aoclib.grid import Grid
 
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
@@ -37,6 +42,13 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--custom", "-C", action="store_true",
         help="Use custom data")
+    parser.add_argument(
+        "--multiplier", "-m", type=int, default=5,
+        help="Tile the map this many times each way for part 2 "
+             "(default: %(default)s)")
+    parser.add_argument(
+        "--astar", "-a", action="store_true",
+        help="Guide the search by the Manhattan distance to the goal")
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="More verbose logging")
@@ -54,12 +66,11 @@ def read_data(input_filename: str):
         return f.readlines()
 
 
-def parse_data(text_data: list[str]) -> list[list[int]]:
-    return [[int(d) for d in line.strip()]
-            for line in text_data]
+def parse_data(text_data: list[str]) -> Grid:
+    return Grid.from_digits(text_data)
 
 
-def load_data(namespace) -> list[list[int]]:
+def load_data(namespace) -> Grid:
     if namespace.custom:
         text_data = ["-1"]
         data = parse_data(text_data)
@@ -76,97 +87,79 @@ def grid_to_str(grid: list[list[int]], prefix="") -> str:
         "".join([str(n) for n in row]) for row in grid) + "\n"
 
 
+def lowest_risk(tile: Grid, mult: int = 1, astar: bool = False) -> int:
+    """The lowest total risk from the top left to the bottom right of the
+    map made of mult x mult copies of tile.
+
+    The tiled map is virtual: a cell's risk is computed from the tile
+    when it is reached, (tile[r % h, c % w] + r // h + c // w - 1) % 9 + 1,
+    so only the distances grow with mult. Risks are 1-9, so Dial's
+    bucket queue replaces a heap: the ring of buckets is indexed by
+    distance modulo its size, and the lowest bucket is always next.
+    With astar, the buckets hold the distance plus the Manhattan
+    distance to the goal, which never overestimates the risk to go.
+    """
+    w, h = tile.width, tile.height
+    width, height = mult * w, mult * h
+    risks = b"".join(tile.row(r) for r in range(h))
+    # Per column and per row: offset within the tile, and the tile's bump
+    col_offset = [c % w for c in range(width)]
+    col_bump = [c // w for c in range(width)]
+    row_base = [(r % h) * w for r in range(height)]
+    row_bump = [r // h for r in range(height)]
+
+    goal = width * height - 1
+    INFINITY = 0xFFFFFFFF
+    dist = array("I", [INFINITY]) * (width * height)
+    dist[0] = 0
+    # Each edge raises a key by 1-9, or 0-10 with the heuristic
+    ring = 12 if astar else 10
+    buckets: list[list[int]] = [[] for _ in range(ring)]
+    key = (width - 1) + (height - 1) if astar else 0
+    buckets[key % ring].append(0)
+    pending = 1
+    while pending:
+        bucket = buckets[key % ring]
+        while not bucket:
+            key += 1
+            bucket = buckets[key % ring]
+        v = bucket.pop()
+        pending -= 1
+        d = dist[v]
+        r, c = divmod(v, width)
+        if (d + (width - 1 - c) + (height - 1 - r) if astar else d) != key:
+            continue            # A stale entry: v was reached more cheaply
+        if v == goal:
+            return d
+        for r2, c2 in ((r, c + 1), (r + 1, c), (r, c - 1), (r - 1, c)):
+            if 0 <= r2 < height and 0 <= c2 < width:
+                risk = (risks[row_base[r2] + col_offset[c2]]
+                        + row_bump[r2] + col_bump[c2] - 1) % 9 + 1
+                u = r2 * width + c2
+                k = d + risk
+                if k < dist[u]:
+                    dist[u] = k
+                    if astar:
+                        k += (width - 1 - c2) + (height - 1 - r2)
+                    buckets[k % ring].append(u)
+                    pending += 1
+    return -1
 
-def explore(grid, row, col, visited, cum_risk, path):
-    logging.debug(f"explore: {row=},{col=}, {visited=}, {cum_risk=}, {path=}")
-    width =  5 # len(grid[0])
-    height =  5 # len(grid)
-    visited = visited | {(row, col)}
-    if row == height - 1 and col == width - 1:
-        print(f"\tEnd: returning {cum_risk=} {path=}")
-        return cum_risk, path
 
-    risk_paths = []
-    choices = []
-    for r, c in [(0, +1), (+1, 0), (0, -1), (-1, 0)]:
-        r2 = row + r
-        c2 = col + c
-        if (r2, c2) not in visited:
-            if 0 <= r2 < height and 0 <= c2 < width:
-                choices.append((grid[r2][c2], r2, c2))
-    choices.sort()
-    for cell_risk, r2, c2 in choices:
-        risk, new_path = explore(grid,
-                        r2, c2,
-                        visited,
-                        cum_risk + cell_risk,
-                        path + [(r2, c2)])
-        if risk is not None:
-            risk_paths.append((risk, new_path))
-    if len(risk_paths) == 0:
-        return None, None
-    print(f"\t{row=},{col=}, #{len(risk_paths)} {risk_paths=}")
-    risk, new_path = sorted(risk_paths)[0]
-    logging.debug(f"{row=},{col=}, chose {risk=} {new_path=}")
-    return risk, new_path
-
-
-def distance_matrix(grid):
-    width = len(grid[0])
-    height = len(grid)
-    d = [[0 for _ in range(width)] for _ in range(height)]
-    for r in range(1, height):
-        d[r][0] = d[r-1][0] + grid[r][0]
-    for c in range(1, width):
-        d[0][c] = d[0][c-1] + grid[0][c]
-    for r in range(1, height):
-        for c in range(1, width):
-            d[r][c] = grid[r][c] + min(d[r-1][c], d[r][c-1])
-    for row in d:
-        logging.debug(",".join(f"{n:2}" for n in row))
-    return d[-1][-1]
-
-
-def compute1(grid: list[list[int]]) -> int:
-    return distance_matrix(grid)
-    # total, path = explore(grid, 0, 0, set(), 0, [(0, 0)])
-    # print(f"\ncompute1: {total=} {path=}")
-    # return total
-
-
-def multiply_tile(tile: list[list[int]], mult: int) -> int:
-    succ = [n + 1 for n in range(9)] + [1]
-    tile_width = len(tile[0])
-    tile_height = len(tile)
-    width, height = mult * tile_width, mult * tile_height    
-    grid = [[0 for _ in range(width)] for _ in range(height)]
-
-    for gr in range(mult):
-        for gc in range(mult):
-            for sr in range(tile_height):
-                dr = gr * tile_height + sr
-                for sc in range(tile_width):
-                    dc = gc * tile_width + sc
-                    risk = tile[sr][sc]
-                    assert 1 <= risk <= 9
-                    for _ in range(gr + gc):
-                        risk = succ[risk]
-                        assert 1 <= risk <= 9
-                    grid[dr][dc] = risk
-                    assert gr + gc == 0 or risk != tile[sr][sc]
-
-
-def compute2(tile: list[list[int]]) -> int:
-    grid = multiply_tile(tile, 5)
-    # Need to use A* for a correct solution
-    return distance_matrix(grid)
+def compute1(grid: Grid) -> int:
+    return lowest_risk(grid)
+
+
+def compute2(tile: Grid, mult: int = 5) -> int:
+    return lowest_risk(tile, mult)
 
 
 def main():
     namespace = parse_args()
-    result1 = compute1(load_data(namespace))
+    result1 = lowest_risk(load_data(namespace), 1, namespace.astar)
     print(f"{result1=}")
-    result2 = compute2(load_data(namespace))
+    result2 = lowest_risk(
+        load_data(namespace), namespace.multiplier, namespace.astar)
     print(f"{result2=}")
 
 
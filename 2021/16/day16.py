@@ -7,11 +7,29 @@ DAY = 16
 
 import argparse
 import logging
+import math
 import os
 
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
 REAL_DATA = f"day{DAY:02}input.txt"
+EXAMPLES = [
+    "D2FE28",
+    "38006F45291200",
+    "EE00D40C823060",
+    "8A004A801A8002F478",
+    "620080001611562C8802118E34",
+    "C0015000016115A2E0802F182340",
+    "A0016C880162017C3686B18A3D4780",
+    "C200B40A82",
+    "04005AC33890",
+    "880086C3E88112",
+    "CE00C43D881120",
+    "D8005AC2A8F0",
+    "F600BC2D8F",
+    "9C005AC2F8F0",
+    "9C0141080250320F1802104A08",
+]
 
 
 def parse_args() -> argparse.Namespace:
@@ -31,12 +49,9 @@ def parse_args() -> argparse.Namespace:
         "--real", "-r", dest="real", action="store_true",
         help="Use {REAL_DATA!r} as input_filename")
 
-    parser.add_argument(
-        "--steps", "-s", type=int,
-        help="Number of steps")
     parser.add_argument(
         "--custom", "-C", action="store_true",
-        help="Use custom data")
+        help="Decode the puzzle's example transmissions")
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="More verbose logging")
@@ -53,114 +68,118 @@ def read_data(input_filename: str):
     with open(os.path.join(os.path.dirname(__file__), input_filename)) as f:
         return f.readlines()
 
-def to_bin(h):
-    b = bin(int(h, 16))[2:]
-    prefix = {0: "", 1: "000", 2: "00", 3: "0"}[len(b) % 4]
-    return prefix + b
-
-
-def parse_data(text_data: list[str]) -> list[list[int]]:
-    return [(line, to_bin(line)) for line in text_data]
-
 
-def load_data(namespace) -> list[list[int]]:
-    if namespace.custom:
-        text_data = ["-1"]
-        data = parse_data(text_data)
-    else:
-        text_data = read_data(namespace.input_filename)
-        logging.info("%s", namespace.input_filename)
-        logging.debug("%s", text_data)
-        data = parse_data(text_data)
-    return data
-
-
-def grid_to_str(grid: list[list[int]], prefix="") -> str:
-    return prefix + ("\n" + prefix).join(
-        "".join([str(n) for n in row]) for row in grid) + "\n"
-
-
-def parse_number(tx, index):
-    packet_type = int(tx[index:index+3], 2)
-    if packet_type != 4:
-        raise ValueError(f"Got {packet_type=} at {index=} in {tx=}")
-    index += 3
-    n = 0
-    count = 2 if tx[index] == "1" else 1
-    while count:
-        nybble = tx[index+1:index+5]
-        n = (n << 4) | int(nybble, 2)
-        print(f"{index=} {nybble=} {n=}")
-        index += 5
-        if count == 1:
-            break
-        elif tx[index] == "0":
-            count = 1
-    return n, index
-
-
-def decode_transmisssion(tx: int):
-    payloads = []
-    index = 0
-    while index < len(tx):
-        version = int(tx[index:index+3], 2)
-        index += 3
-        packet_type = int(tx[index:index+3], 2)
-        print(f"{version=} {packet_type=}")
-        if packet_type == 4:
-            n, index = parse_number(tx, index)
-            print(f"Got {n}, {index=}")
-            payloads.append((4, n))
-        elif packet_type == 6:
-            index += 3
-            length_type_id = tx[index]
-            index += 1
-            sub_packets = []
-            if length_type_id == "0":
-                r = total_length_in_bits = int(tx[index:index+15], 2)
-                index += 15
-                while r > 0:
-                    n, index2 = parse_number(tx, index)
-                    sub_packets.append(n)
-                    r -= (index2 - index)
-                    index = index2
-                print(f"LTI:0 TLIB={total_length_in_bits}, {sub_packets=}")
+def parse_data(text_data: list[str]) -> bytes:
+    """The first transmission, two hex digits to a byte"""
+    return next(bytes.fromhex(line.strip())
+                for line in text_data if line.strip())
+
+
+def read_bits(data: bytes, pos: int, n: int) -> int:
+    """The n-bit big-endian field starting at bit pos of data.
+
+    Only the bytes spanning the field are converted to an int, so a read
+    costs O(n) however long the transmission is.
+    """
+    start, end = pos >> 3, (pos + n + 7) >> 3
+    chunk = int.from_bytes(data[start:end], "big")
+    return (chunk >> ((end << 3) - pos - n)) & ((1 << n) - 1)
+
+
+LITERAL = 4
+OPS = {
+    0: sum,
+    1: math.prod,
+    2: min,
+    3: max,
+    5: lambda v: int(v[0] > v[1]),
+    6: lambda v: int(v[0] < v[1]),
+    7: lambda v: int(v[0] == v[1]),
+}
+
+
+def decode(data: bytes, keep_tree: bool = False) -> tuple[int, int, tuple]:
+    """(version sum, value, tree) of the outermost packet in data.
+
+    Operators are pushed as [version, type_id, end, count, values, children]
+    frames: end is the bit position that closes a length-type-0 packet,
+    count the number of sub-packets of a length-type-1 one. Each literal
+    is folded into the frames above it as soon as it is read, so nesting
+    depth costs heap, not recursion. Tree nodes are
+    (version, type_id, value, children) and are only built if keep_tree.
+    """
+    limit = len(data) << 3
+    pos = version_sum = 0
+    stack: list[list] = []
+    while True:
+        if pos + 6 > limit:
+            raise ValueError(f"Transmission truncated at bit {pos}")
+        version = read_bits(data, pos, 3)
+        type_id = read_bits(data, pos + 3, 3)
+        version_sum += version
+        pos += 6
+        if type_id != LITERAL:
+            if read_bits(data, pos, 1):
+                frame = [version, type_id, None,
+                         read_bits(data, pos + 1, 11), [], []]
+                pos += 12
             else:
-                number_of_sub_packets = int(tx[index:index+11], 2)
-                index += 11
-                for _ in range(number_of_sub_packets):
-                    n, index = parse_number(tx, index)
-                    sub_packets.append(n)
-                print(f"LTI:1 #packets={number_of_sub_packets}, {sub_packets=}")
-        index = (index + 3) & ~3
-    return payloads
-
-# See https://github.com/pantaryl/adventofcode/blob/main/2021/src/day16.py
-
-def compute1(transmissions: list[int]) -> int:
-    for i, (hex, tx) in enumerate(transmissions):
-        decode_transmisssion(tx)
-
-
-def compute2(tile: list[list[int]]) -> int:
-    return 0
+                frame = [version, type_id,
+                         pos + 16 + read_bits(data, pos + 1, 15), None, [], []]
+                pos += 16
+            if frame[2] == pos or frame[3] == 0:
+                raise ValueError(f"Empty operator packet before bit {pos}")
+            stack.append(frame)
+            continue
+
+        value = 0
+        while True:
+            group = read_bits(data, pos, 5)
+            pos += 5
+            value = (value << 4) | (group & 0xF)
+            if not group & 0x10:
+                break
+        node = (version, LITERAL, value, ()) if keep_tree else None
+
+        # Close every operator that this packet completes
+        while stack:
+            frame = stack[-1]
+            frame[4].append(value)
+            if keep_tree:
+                frame[5].append(node)
+            end, count = frame[2], frame[3]
+            if (pos < end) if count is None else (len(frame[4]) < count):
+                break
+            stack.pop()
+            value = OPS[frame[1]](frame[4])
+            if keep_tree:
+                node = (frame[0], frame[1], value, tuple(frame[5]))
+        else:
+            return version_sum, value, node
+
+
+def compute1(tx: bytes) -> int:
+    return decode(tx)[0]
+
+
+def compute2(tx: bytes) -> int:
+    return decode(tx)[1]
 
 
 def main():
-    examples = parse_data([
-#        "D2FE28",
-        "38006F45291200",
-        "EE00D40C823060",
-        "8A004A801A8002F478",
-        "620080001611562C8802118E34",
-        "C0015000016115A2E0802F182340",
-        "A0016C880162017C3686B18A3D4780",
-    ])
     namespace = parse_args()
-    result1 = compute1(examples)
-    print(f"{result1=}")
-    result2 = compute2(load_data(namespace))
-    print(f"{result2=}")
+    if namespace.custom:
+        transmissions = [parse_data([line]) for line in EXAMPLES]
+    else:
+        logging.info("%s", namespace.input_filename)
+        transmissions = [parse_data(read_data(namespace.input_filename))]
+    for tx in transmissions:
+        version_sum, value, tree = decode(tx, keep_tree=namespace.verbose)
+        logging.debug("%s: %r", tx.hex().upper(), tree)
+        result1 = version_sum
+        print(f"{result1=}")
+        result2 = value
+        print(f"{result2=}")
 
 
 if __name__ == "__main__":
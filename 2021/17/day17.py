@@ -6,8 +6,12 @@ DAY = 17
 # https://adventofcode.com/2021/day/17
 
 import argparse
+import bisect
+import itertools
 import logging
+import math
 import os
+from typing import Callable, Iterator
 
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
@@ -77,74 +81,140 @@ def grid_to_str(grid: list[list[int]], prefix="") -> str:
         "".join([str(n) for n in row]) for row in grid) + "\n"
 
 
-def x_velocities(x1, x2):
-    values = []
-    for xv1 in range(x2, 1, -1):
-        px = 0
-        for xv2 in range(xv1, -1, -1):
-            px += xv2
-            if x1 <= px <= x2:
-                values.append((xv1, xv1 - xv2 + 1))
-                break
-            elif px > x2:
-                break
-    values.reverse()
-    return values
-
-
-def probe_path(xv, yv, x1, x2, y1, y2):
-    px = py = 0
-    path = [(px, py)]
-    y_max = y1
-    logging.debug(f"{px=},{py=} {xv=},{yv=} {x1=},{x2=} {y1=},{y2=}")
-    while True:
-        px += xv; py += yv
-        y_max = max(py, y_max)
-        path.append((px, py))
-        if xv:
-            xv += -1 if xv > 0 else +1
-        yv -= 1
-        msg = f"{px=},{py=} {xv=},{yv=}"
-        if x1 <= px <= x2 and y1 <= py <= y2:
-            logging.debug("%s hit target!", msg)
-            return path, y_max
-        if px > x2 or py < y1:
-            logging.debug("%s missed target!", msg)
-            return None, y1
-
-
-def compute1(x1, x2, y1, y2) -> int:
-    # print(f"{x1=} {x2=} {y1=} {y2=}") 
-    # path, y_max = probe_path(7, 2, x1, x2, y1, y2)
-    # print(f"{path=} {y_max=}\n")
-    # path, y_max = probe_path(6, 3, x1, x2, y1, y2)
-    # print(f"{path=} {y_max=}\n")
-    # path, y_max = probe_path(9, 0, x1, x2, y1, y2)
-    # print(f"{path=} {y_max=}\n")
-    # path, y_max = probe_path(17, -4, x1, x2, y1, y2)
-    # print(f"{path=} {y_max=}\n")
-    # path, y_max = probe_path(6, 9, x1, x2, y1, y2)
-    # print(f"{path=} {y_max=}\n")
-    xv, steps = x_velocities(x1, x2)[0]
-    best_y_max = y1
-    best_yv = None
-    for yv in range(1, 1000):
-        path, y_max = probe_path(xv, yv, x1, x2, y1, y2)
-        logging.debug(yv, y_max)
-        if y_max > best_y_max:
-            best_y_max = y_max
-            best_yv = yv
-    return best_y_max, best_yv
+def triangle(n: int) -> int:
+    return n * (n + 1) // 2
+
+
+def triangle_root(q: int) -> int:
+    """The largest m >= 0 with triangle(m) <= q"""
+    return (math.isqrt(8 * q + 1) - 1) // 2 if q >= 0 else -1
+
+
+def x_runs(x1: int, x2: int) -> Iterator[tuple[int, int, float]]:
+    """(count, first, last) for runs of x-velocities sharing a step set.
+
+    After n <= v steps, velocity v is at triangle(v) - triangle(v - n):
+    in range from step `first` through step `last`, or forever (last is
+    math.inf) if the probe comes to rest inside [x1, x2]. Both ends only
+    fall as v rises, so each run is closed off analytically.
+    """
+    v = triangle_root(x1 - 1) + 1          # slower probes stop short
+    rest = triangle_root(x2)               # faster probes overshoot
+    while v <= x2:
+        stop = triangle(v)
+        first = v - triangle_root(stop - x1)
+        end = x2
+        if first > 1:
+            # first step stays put while (first - 1) steps fall short
+            end = min(end, (x1 - 1 + triangle(first - 2)) // (first - 1))
+        if v <= rest:
+            last = math.inf
+            end = min(end, rest)
+        else:
+            last = v - triangle_root(stop - x2 - 1) - 1
+            if last > 0:
+                end = min(end, (x2 + triangle(last - 1)) // last)
+        if first <= last:
+            yield end - v + 1, first, last
+        v = end + 1
+
+
+def y_runs(y1: int, y2: int) -> Iterator[tuple[int, int, int, int]]:
+    """(k_lo, k_hi, first, last) for runs of downward speeds k >= 1.
+
+    A probe launched at y-velocity -k is triangle(k + n - 1) -
+    triangle(k - 1) below the origin after n steps. One launched at
+    k - 1 >= 0 comes back through y=0 at step 2k - 1 moving at -k, so the
+    same run serves it with its steps shifted by 2k - 1.
+    """
+    k = 1
+    while k <= -y1:
+        base = triangle(k - 1)
+        first = max(1, triangle_root(base - y2 - 1) - k + 2)
+        last = triangle_root(base - y1) - k + 1
+        # last step stays put while `last` steps reach no deeper than y1
+        end = (-y1 - triangle(last - 1)) // last
+        if first > 1:
+            end = min(end, (-y2 - 1 - triangle(first - 2)) // (first - 1))
+        if first <= last:
+            yield k, end, first, last
+        k = end + 1
+
+
+def step_counter(
+        x1: int, x2: int) -> tuple[Callable[[int, int], int], int, int]:
+    """(count, resting, horizon) for the x-velocities.
+
+    count(first, last) is how many x-velocities are in range at some step
+    from first through last: all of them, less those whose range ends
+    before first or starts after last, each found by bisection over the
+    runs. Past step horizon only the resting probes are still in range.
+    """
+    runs = list(x_runs(x1, x2))
+    total = sum(n for n, _, _ in runs)
+    resting = sum(n for n, _, last in runs if last == math.inf)
+    horizon = max([first for _, first, _ in runs]
+                  + [last for _, _, last in runs if last != math.inf],
+                  default=0)
+    runs.sort(key=lambda r: r[1])
+    firsts = [first for _, first, _ in runs]
+    starting = list(itertools.accumulate((n for n, _, _ in runs), initial=0))
+    runs.sort(key=lambda r: r[2])
+    lasts = [last for _, _, last in runs]
+    ending = list(itertools.accumulate((n for n, _, _ in runs), initial=0))
+
+    def count(first: int, last: int) -> int:
+        if first > horizon:
+            return resting
+        ended = ending[bisect.bisect_left(lasts, first)]
+        later = total - starting[bisect.bisect_right(firsts, last)]
+        return total - ended - later
+
+    return count, resting, horizon
+
+
+def trick_shots(x1: int, x2: int, y1: int,
+                y2: int) -> tuple[int, int | None]:
+    """(number of hitting velocities, highest hitting y-velocity)"""
+    if x1 <= 0 or y2 >= 0:
+        raise ValueError("Target must lie below and to the right: "
+                         f"x={x1}..{x2}, y={y1}..{y2}")
+    count, resting, horizon = step_counter(x1, x2)
+    total, highest = 0, None
+    for k_lo, k_hi, first, last in y_runs(y1, y2):
+        hits = count(first, last)
+        total += hits * (k_hi - k_lo + 1)
+        if hits and highest is None:
+            highest = -k_lo
+        # Launched upwards at k - 1, the same steps shifted by 2k - 1
+        resting_from = max(k_lo, (horizon + 1 - first) // 2 + 1)
+        for k in range(k_lo, min(k_hi + 1, resting_from)):
+            hits = count(first + 2 * k - 1, last + 2 * k - 1)
+            if hits:
+                total += hits
+                highest = k - 1
+        if resting and resting_from <= k_hi:
+            total += resting * (k_hi - resting_from + 1)
+            highest = k_hi - 1
+    logging.debug("%d velocities, highest yv=%s", total, highest)
+    return total, highest
+
+
+def compute1(x1, x2, y1, y2) -> tuple[int, int | None]:
+    """(highest point reached, the y-velocity that reaches it).
+
+    (0, None) if no velocity hits the target, like compute2's count of 0.
+    """
+    _, yv = trick_shots(x1, x2, y1, y2)
+    if yv is None:
+        logging.info("No velocity hits the target")
+        return 0, None
+    return triangle(max(yv, 0)), yv
 
 
 def compute2(x1, x2, y1, y2) -> int:
-    count = 0
-    for xv, steps in x_velocities(x1, x2):
-        for yv in range(y1, 4000):
-            path, y_max = probe_path(xv, yv, x1, x2, y1, y2)
-            if path is not None:
-                count += 1
-    return count
+    """How many velocities hit the target: 0 if none do"""
+    return trick_shots(x1, x2, y1, y2)[0]
 
 
 def main():
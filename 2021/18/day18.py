@@ -8,6 +8,9 @@ DAY = 18
 import argparse
 import logging
 import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 
 
 TEST_DATA = f"day{DAY:02}test_input.txt"
@@ -21,7 +24,6 @@ def parse_args() -> argparse.Namespace:
         input_filename=None,
         real=True,
         verbose=False,
-        custom=False,
     )
     group = parser.add_mutually_exclusive_group()
     group.add_argument(
@@ -32,11 +34,8 @@ def parse_args() -> argparse.Namespace:
         help="Use {REAL_DATA!r} as input_filename")
 
     parser.add_argument(
-        "--steps", "-s", type=int,
-        help="Number of steps")
-    parser.add_argument(
-        "--custom", "-C", action="store_true",
-        help="Use custom data")
+        "--jobs", "-j", type=int, default=os.cpu_count(),
+        help="Worker processes for part 2 (default: %(default)s)")
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="More verbose logging")
@@ -54,42 +53,252 @@ def read_data(input_filename: str):
         return f.readlines()
 
 
-def parse_data(text_data: list[str]) -> list[list[int]]:
-    return [[int(d) for d in line.strip()]
-            for line in text_data]
+# A snailfish number is its regular numbers, left to right, in two
+# parallel arrays: each value, and how many pairs enclose it.
+Number = tuple[array, array]
+# A number prepared for addition: what it spills to either side, and
+# the index of its first value to split
+Addend = tuple[array, array, "int | None", int, int]
+
+EXPLODE = 5     # nested inside four pairs
+PAIRS_PER_TASK = 50_000
+
+SPANS = [16 >> d for d in range(EXPLODE)]
+WEIGHTS = [[3 ** (d - bin(offset >> (4 - d)).count("1"))
+            * 2 ** bin(offset >> (4 - d)).count("1")
+            for offset in range(16)] for d in range(EXPLODE)]
+
+
+def parse_number(line: str) -> Number:
+    values, depths = array("i"), array("i")
+    depth = 0
+    digits = ""
+    for c in line:
+        if c.isdigit():
+            digits += c
+            continue
+        if digits:
+            values.append(int(digits))
+            depths.append(depth)
+            digits = ""
+        if c == "[":
+            depth += 1
+        elif c == "]":
+            depth -= 1
+    return values, depths
+
+
+def parse_data(text_data: list[str]) -> list[Number]:
+    return [parse_number(line.strip()) for line in text_data if line.strip()]
+
+
+def to_str(number: Number) -> str:
+    """The bracketed form, rebuilt from the depths alone"""
+    values, depths = number
+    parts: list[str] = []
+    open_ = 0       # pairs opened so far around the current position
+    # per depth, whether the next element there is a left child
+    left = [True] * (max(depths, default=0) + 2)
+    for v, d in zip(values, depths):
+        while open_ < d:
+            open_ += 1
+            parts.append("[")
+            left[open_] = True
+        parts.append(str(v))
+        # close every pair this value completes
+        while open_ and not left[open_]:
+            parts.append("]")
+            open_ -= 1
+        if open_:
+            left[open_] = False
+            parts.append(",")
+    return "".join(parts)
+
+
+def explode_all(values: array, depths: array) -> tuple[int | None, int]:
+    """Explode every pair nested inside four others, in one pass.
+
+    Written back over the same arrays: each pair at depth EXPLODE
+    collapses to a 0 one level up, so the write index never overtakes
+    the read index. Its right half is carried into the next value read.
+    Returns what falls off the ends: the left half of the first pair, if
+    it exploded, and the right half of the last.
+    """
+    n = len(values)
+    w = r = carry = 0
+    spill = None
+    while r < n:
+        if depths[r] == EXPLODE:
+            if w:
+                values[w - 1] += values[r] + carry
+            else:
+                spill = values[r]
+            carry = values[r + 1]
+            values[w] = 0
+            depths[w] = EXPLODE - 1
+            r += 2
+        else:
+            values[w] = values[r] + carry
+            depths[w] = depths[r]
+            carry = 0
+            r += 1
+        w += 1
+    del values[w:], depths[w:]
+    return spill, carry
+
+
+def prepare(number: Number) -> Addend:
+    """The number as either half of a sum: one pair deeper, exploded.
+
+    A reduced number only has pairs to explode once it is deepened, and
+    apart from what spills over its ends they explode the same way
+    whatever it is added to, so this is done once per number, not once
+    per sum, along with the first place that may need splitting.
+    """
+    values = array("i", number[0])
+    depths = array("i", [d + 1 for d in number[1]])
+    spill, carry = explode_all(values, depths)
+    big = next((i for i, v in enumerate(values) if v >= 10), len(values))
+    return values, depths, spill, carry, big
+
 
+def split_all(values: array, depths: array, i: int = 0) -> None:
+    """Split the leftmost regular number >= 10 until there are none.
 
-def load_data(namespace) -> list[list[int]]:
-    if namespace.custom:
-        text_data = ["-1"]
-        data = parse_data(text_data)
+    With every explosion already done, splitting a value at depth
+    EXPLODE - 1 makes a pair that explodes at once: its halves go to the
+    neighbours and a 0 stays behind, after which only the neighbour to
+    the left can have become the new leftmost number to split. Nothing
+    before index i may need splitting.
+    """
+    n = len(values)
+    while i < n:
+        v = values[i]
+        if v < 10:
+            i += 1
+            continue
+        d = depths[i]
+        if d < EXPLODE - 1:
+            values[i] = v // 2
+            depths[i] = d + 1
+            values.insert(i + 1, v - v // 2)
+            depths.insert(i + 1, d + 1)
+            n += 1
+        else:
+            values[i] = 0
+            if i + 1 < n:
+                values[i + 1] += v - v // 2
+            if i:
+                values[i - 1] += v // 2
+                i -= 1
+
+
+def add(a: Addend, b: Addend) -> Number:
+    """The reduced sum of two prepared numbers, neither of them changed"""
+    values = a[0] + b[0]
+    depths = a[1] + b[1]
+    # What crosses the seam: a's carry goes to the next regular number,
+    # which is b's first unless that exploded too and sent it left
+    seam = len(a[0])
+    if b[2] is not None:
+        values[seam - 1] += b[2] + a[3]
+        start = seam - 1
     else:
-        text_data = read_data(namespace.input_filename)
-        logging.info("%s", namespace.input_filename)
-        logging.debug("%s", text_data)
-        data = parse_data(text_data)
-    return data
+        values[seam] += a[3]
+        start = seam
+    split_all(values, depths, min(a[4], start, seam + b[4]))
+    return values, depths
+
+
+def magnitude(number: Number) -> int:
+    """Sum each value weighted by the path down to it.
+
+    Every left turn triples a value and every right turn doubles it. A
+    value at depth d starting offset/16 of the way along a reduced number
+    took the turns spelt by the top d bits of offset, so the weight is
+    WEIGHTS[d][offset] and the offset advances by 16 >> d.
+    """
+    total = offset = 0
+    for v, d in zip(*number):
+        total += v * WEIGHTS[d][offset]
+        offset += SPANS[d]
+    return total
+
+
+def total_sum(numbers: list[Number]) -> Number:
+    total = numbers[0]
+    for number in numbers[1:]:
+        total = add(prepare(total), prepare(number))
+    return total
+
+
+def best_in_rows(addends: list[Addend], rows: range) -> int:
+    """The largest magnitude of addends[i] + addends[j] for i in rows"""
+    best = 0
+    for i in rows:
+        a = addends[i]
+        for j, b in enumerate(addends):
+            if i != j:
+                best = max(best, magnitude(add(a, b)))
+    return best
+
+
+# Each worker process's own prepared copy of the numbers
+_worker_addends: list[Addend] = []
+
+
+def init_worker(numbers: list[Number]) -> None:
+    global _worker_addends
+    _worker_addends = [prepare(n) for n in numbers]
+
+
+def best_in_block(rows: range) -> int:
+    return best_in_rows(_worker_addends, rows)
 
 
-def grid_to_str(grid: list[list[int]], prefix="") -> str:
-    return prefix + ("\n" + prefix).join(
-        "".join([str(n) for n in row]) for row in grid) + "\n"
+def largest_magnitude(numbers: list[Number], jobs: int = 1) -> int:
+    """The largest magnitude of any sum of two different numbers.
 
+    Snailfish addition isn't commutative, so all n * (n - 1) ordered
+    pairs are tried. Blocks of rows, each worth about PAIRS_PER_TASK
+    additions, go to jobs worker processes. Every worker receives and
+    prepares the numbers once, when it starts; a task is just its rows.
+    """
+    n = len(numbers)
+    if jobs <= 1 or n * n <= PAIRS_PER_TASK:
+        return best_in_rows([prepare(number) for number in numbers],
+                            range(n))
+    step = max(1, PAIRS_PER_TASK // n)
+    blocks = [range(i, min(i + step, n)) for i in range(0, n, step)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                             initargs=(numbers,)) as executor:
+        best = max(executor.map(best_in_block, blocks))
+    seconds = time.perf_counter() - start
+    logging.debug("%d pairs in %d blocks on %d workers: %.3fs, %.0f pairs/s",
+                  n * (n - 1), len(blocks), jobs, seconds,
+                  n * (n - 1) / seconds)
+    return best
 
 
-def compute1(grid: list[list[int]]) -> int:
-    return 0
+def compute1(numbers: list[Number]) -> int:
+    return magnitude(total_sum(numbers)) if numbers else 0
 
 
-def compute2(tile: list[list[int]]) -> int:
-    return 0
+def compute2(numbers: list[Number], jobs: int = 1) -> int:
+    return largest_magnitude(numbers, jobs)
 
 
 def main():
     namespace = parse_args()
-    result1 = compute1(load_data(namespace))
+    text_data = read_data(namespace.input_filename)
+    logging.info("%s", namespace.input_filename)
+    numbers = parse_data(text_data)
+    if numbers:
+        logging.debug("sum: %s", to_str(total_sum(numbers)))
+    result1 = compute1(numbers)
     print(f"{result1=}")
-    result2 = compute2(load_data(namespace))
+    result2 = largest_magnitude(numbers, namespace.jobs)
     print(f"{result2=}")
 
 
@@ -9,6 +9,10 @@ DAY = 5
 import argparse
 import logging
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from aoclib.cache import cache_payload
 
 
 TEST_DATA = "test_input.txt"
@@ -82,6 +86,7 @@ def parse_data(text_data: str) -> list[list[str]]:
     return stacks, moves
 
 
+@cache_payload
 def load_data(namespace) -> list[list[int]]:
     if namespace.custom:
         text_data = ["-1"]
@@ -11,6 +11,10 @@ import json
 import logging
 import os
 import pprint
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from aoclib.cache import cache_payload
 
 
 TEST_DATA = "test_input.txt"
@@ -62,6 +66,7 @@ def read_data(input_filename: str):
         return f.read()
 
 
+@cache_payload
 def load_data(namespace) -> list[str]:
     if namespace.custom:
         text_data = ["-1"]
@@ -11,6 +11,16 @@ import json
 import logging
 import os
 import pprint
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from aoclib.cache import cache_payload
+from aoclib.grid import Grid
 
 
 TEST_DATA = "test_input.txt"
@@ -40,10 +50,15 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--custom", "-C", action="store_true",
         help="Use custom data")
+    parser.add_argument(
+        "--backend", "-B", choices=("python", "numpy"), default="python",
+        help="Implementation to run (default: %(default)s)")
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="More verbose logging")
     namespace = parser.parse_args()
+    if namespace.backend == "numpy" and np is None:
+        parser.error("--backend numpy needs NumPy")
 
     namespace.input_filename = REAL_DATA if namespace.real else TEST_DATA
     log_level = logging.DEBUG if namespace.verbose else logging.INFO
@@ -62,7 +77,8 @@ def read_data(input_filename: str):
         return f.read()
 
 
-def load_data(namespace) -> list[str]:
+@cache_payload
+def load_data(namespace) -> Grid:
     if namespace.custom:
         text_data = ["-1"]
         data = parse_data(text_data)
@@ -75,115 +91,148 @@ def load_data(namespace) -> list[str]:
     return data
 
 
-def parse_data(text_data: str) -> list[list[int]]:
-    lines = [s.strip() for s in text_data.strip().split('\n')]
-    return [[int(n) for n in line] for line in lines]
-
+def parse_data(text_data: str) -> Grid:
+    return Grid.from_digits(text_data.strip().split("\n"))
 
-def neighbors(grid: list[list[int]], row: int, col: int) -> list[tuple[int, int]]:
-    width, height = len(grid[0]), len(grid)
-    result = []
-    for r, c in ((-1, -1), (-1, +1), (+1, -1), (+1, +1)):
-        r2, c2 = row + r, col + c
-        if 0 <= r2 < height and 0 <= c2 < width:
-            result.append((r2, c2))
 
+def is_visible(grid: Grid, row: int, col: int) -> int:
+    cells, stride = grid.cells, grid.stride
+    i = grid.index(row, col)
+    cell = cells[i]
 
-def is_visible(grid, row, col) -> int:
-    width, height = len(grid[0]), len(grid)
-    cell = grid[row][col]
-
-    for r in range(row-1, -1, -1):
-        if grid[r][col] >= cell:
+    for j in range(i - stride, -1, -stride):
+        if cells[j] >= cell:
             break
     else:
         return 1
-    for r in range(row+1, height, +1):
-        if grid[r][col] >= cell:
+    for j in range(i + stride, len(cells), stride):
+        if cells[j] >= cell:
             break
     else:
         return 1
-    for c in range(col-1, -1, -1):
-        if grid[row][c] >= cell:
+    for j in range(i - 1, i - col - 1, -1):
+        if cells[j] >= cell:
             break
     else:
         return 1
-    for c in range(col+1, width, +1):
-        if grid[row][c] >= cell:
+    for j in range(i + 1, i - col + grid.width):
+        if cells[j] >= cell:
             break
     else:
         return 1
     return 0
 
 
-
-def compute1(grid: list[list[int]]) -> int:
-    width, height = len(grid[0]), len(grid)
+def compute1(grid: Grid) -> int:
+    width, height = grid.width, grid.height
 
     logging.debug(grid_to_str(grid))
-    visible = [[0 for _ in range(width)] for _ in range(height)]
+    visible = Grid(width, height)
 
     for row in range(0, height):
         for col in range(0, width):
-            visible[row][col] = is_visible(grid, row, col)
+            visible[row, col] = is_visible(grid, row, col)
 
     logging.debug(grid_to_str(visible))
-    return sum([sum(row) for row in visible])
+    return visible.count(1)
 
 
-def viewing_distance(grid, row, col) -> int:
-    width, height = len(grid[0]), len(grid)
-    cell = grid[row][col]
+def viewing_distance(grid: Grid, row: int, col: int) -> int:
+    width, height = grid.width, grid.height
+    cells, stride = grid.cells, grid.stride
+    i = grid.index(row, col)
+    cell = cells[i]
 
-    for r in range(row-1, -1, -1):
-        if grid[r][col] >= cell:
-            left = row -r
+    for j in range(i - stride, -1, -stride):
+        if cells[j] >= cell:
+            left = (i - j) // stride
             break
     else:
         left = row
-    for r in range(row+1, height, +1):
-        if grid[r][col] >= cell:
-            right = r - row
+    for j in range(i + stride, len(cells), stride):
+        if cells[j] >= cell:
+            right = (j - i) // stride
             break
     else:
         right = height - 1 - row
-    for c in range(col-1, -1, -1):
-        if grid[row][c] >= cell:
-            up = col - c
+    for j in range(i - 1, i - col - 1, -1):
+        if cells[j] >= cell:
+            up = i - j
             break
     else:
         up = col
-    for c in range(col+1, width, +1):
-        if grid[row][c] >= cell:
-            down = c - col
+    for j in range(i + 1, i - col + width):
+        if cells[j] >= cell:
+            down = j - i
             break
     else:
         down = width - 1 - col
     dist = left * right * up * down
-    logging.debug(f"{row=} {col=} {dist=} {left=} {right=} {up=} {down=}")
+    logging.debug("row=%d col=%d dist=%d left=%d right=%d up=%d down=%d",
+                  row, col, dist, left, right, up, down)
     return dist
 
 
-def compute2(grid: list[list[int]]) -> int:
-    width, height = len(grid[0]), len(grid)
+def compute2(grid: Grid) -> int:
+    width, height = grid.width, grid.height
 
-    distance = [[0 for _ in range(width)] for _ in range(height)]
+    distance = Grid(width, height, typecode="I")
 
     for row in range(0, height):
         for col in range(0, width):
-            distance[row][col] = viewing_distance(grid, row, col)
+            distance[row, col] = viewing_distance(grid, row, col)
 
     logging.debug(grid_to_str(distance, separator=", "))
-    return max([max(row) for row in distance])
+    return max(distance.cells)
+
+
+def compute1_numpy(grid: Grid) -> int:
+    trees = grid.to_numpy().astype(np.int8)
+    visible = np.zeros(trees.shape, dtype=bool)
+    # Rotate each edge in turn to the left and look in from there
+    for k in range(4):
+        view = np.rot90(trees, k)
+        blocking = np.full(view.shape, -1, dtype=np.int8)
+        blocking[:, 1:] = np.maximum.accumulate(view, axis=1)[:, :-1]
+        seen = np.rot90(visible, k)
+        seen |= view > blocking
+    return int(np.count_nonzero(visible))
+
+
+def seen_to_left(view: np.ndarray) -> np.ndarray:
+    """How many trees each tree sees to its left"""
+    rows, cols = view.shape
+    # nearest[r, h]: column of the nearest tree at least h tall so far
+    nearest = np.zeros((rows, 10), dtype=np.int64)
+    distance = np.zeros(view.shape, dtype=np.int64)
+    all_rows, heights = np.arange(rows), np.arange(10)
+    for c in range(cols):
+        column = view[:, c]
+        distance[:, c] = c - nearest[all_rows, column]
+        nearest[heights <= column[:, None]] = c
+    return distance
+
+
+def compute2_numpy(grid: Grid) -> int:
+    trees = grid.to_numpy()
+    score = np.ones(trees.shape, dtype=np.int64)
+    for k in range(4):
+        rotated = np.rot90(score, k)
+        rotated *= seen_to_left(np.rot90(trees, k))
+    return int(score.max())
 
 
 def main():
     namespace = parse_args()
+    if namespace.backend == "numpy":
+        part1, part2 = compute1_numpy, compute2_numpy
+    else:
+        part1, part2 = compute1, compute2
     payload = load_data(namespace)
-    result1 = compute1(payload)
+    result1 = part1(payload)
     print(f"{result1=}")
     payload = load_data(namespace)
-    result2 = compute2(payload)
+    result2 = part2(payload)
     print(f"{result2=}")
 
 
@@ -11,6 +11,10 @@ import json
 import logging
 import os
 import pprint
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from aoclib import trace
 
 
 TEST_DATA = "test_input.txt"
@@ -52,6 +56,8 @@ def parse_args() -> argparse.Namespace:
         namespace.input_filename = REAL_DATA if namespace.real else TEST_DATA
     log_level = logging.DEBUG if namespace.verbose else logging.INFO
     logging.basicConfig(level=log_level)
+    if namespace.verbose:
+        trace.enable()
 
     return namespace
 
@@ -124,19 +130,24 @@ def bounding_box(moves: list[tuple[str, int]]):
 
 
 def compute1(moves: list[tuple[str, int]]) -> int:
+    tracing = trace.enabled
     hx = hy = tx = ty = 0
     min_x, min_y, max_x, max_y = bounding_box(moves)
-    draw_grid(hx, hy, tx, ty, min_x, min_y, max_x, max_y)
+    if tracing:
+        draw_grid(hx, hy, tx, ty, min_x, min_y, max_x, max_y)
     tail_positions = set()
     tail_positions.add((tx, ty))
     for dir, n in moves:
-        logging.debug(f"\n\n== {dir} {n} ==")
+        if tracing:
+            trace.event("\n\n== %s %d ==", dir, n)
         dx, dy = delta(dir)
         for i in range(n):
             px, py = abs(hx - tx), abs(hy - ty)
             hx += dx; hy += dy
             sx, sy = abs(hx - tx), abs(hy - ty)
-            logging.debug(f"{hx=} {hy=} {tx=} {ty=} {sx=} {sy=}")
+            if tracing:
+                trace.event("hx=%d hy=%d tx=%d ty=%d sx=%d sy=%d",
+                            hx, hy, tx, ty, sx, sy)
             if sx == 2 and sy == 0:
                 tx += dx
                 tail_positions.add((tx, ty))
@@ -158,14 +169,16 @@ def compute1(moves: list[tuple[str, int]]) -> int:
                     assert 0 <= sx < 2 and 0 <= sy < 2
                 tail_positions.add((tx, ty))
 
-            draw_grid(hx, hy, tx, ty, min_x, min_y, max_x, max_y)
+            if tracing:
+                draw_grid(hx, hy, tx, ty, min_x, min_y, max_x, max_y)
 
-    logging.info(tail_positions)
+    if tracing:
+        trace.event("%s", tail_positions)
     return len(tail_positions)
 
 
 def draw_rope(rope, min_x, min_y, max_x, max_y):
-    if not logging.root.isEnabledFor(logging.DEBUG):
+    if not trace.enabled:
         return
 
     width = max_x - min_x + 1
@@ -190,13 +203,15 @@ def offset(h, t):
 
 
 def compute2(moves: list[tuple[str, int]], knots=10) -> int:
+    tracing = trace.enabled
     min_x, min_y, max_x, max_y = bounding_box(moves)
     rope = [(0, 0) for _ in range(knots)]
     draw_rope(rope, min_x, min_y, max_x, max_y)
     tail_positions = set()
 
     for dir, n in moves:
-        logging.debug(f"\n\n== {dir} {n} ==")
+        if tracing:
+            trace.event("\n\n== %s %d ==", dir, n)
         dx, dy = delta(dir)
         for i in range(n):
             rope[0] = (rope[0][0] + dx, rope[0][1] + dy)
@@ -206,7 +221,9 @@ def compute2(moves: list[tuple[str, int]], knots=10) -> int:
                 tx, ty = rope[k]
                 nx, ny = rope[k]
                 sx, sy = abs(hx - tx), abs(hy - ty)
-                logging.debug(f"{k=} {hx=} {hy=} {tx=} {ty=} {sx=} {sy=}")
+                if tracing:
+                    trace.event("k=%d hx=%d hy=%d tx=%d ty=%d sx=%d sy=%d",
+                                k, hx, hy, tx, ty, sx, sy)
                 if sy == 0:
                     nx = hx + offset(hx, tx)
                 elif sx == 0:
@@ -220,7 +237,8 @@ def compute2(moves: list[tuple[str, int]], knots=10) -> int:
                 else:
                     nx = hx + offset(hx, tx)
                     ny = hy + offset(hy, ty)
-                logging.debug(f"\t{nx=} {ny=}")
+                if tracing:
+                    trace.event("\tnx=%d ny=%d", nx, ny)
                 rope[k] = (nx, ny)
                 if k == knots - 1:
                     tail_positions.add((nx, ny))
@@ -228,8 +246,9 @@ def compute2(moves: list[tuple[str, int]], knots=10) -> int:
                     draw_rope(rope, min_x, min_y, max_x, max_y)
                     assert False
 
-            logging.debug(rope)
-            draw_rope(rope, min_x, min_y, max_x, max_y)
+            if tracing:
+                trace.event("%s", rope)
+                draw_rope(rope, min_x, min_y, max_x, max_y)
 
     # logging.info(tail_positions)
     return len(tail_positions)
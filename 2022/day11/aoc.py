@@ -15,6 +15,11 @@ import math
 import operator
 import os
 import pprint
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from aoclib import trace
+from aoclib.cache import cache_payload
 
 
 TEST_DATA = "test_input.txt"
@@ -57,6 +62,8 @@ def parse_args() -> argparse.Namespace:
     namespace.input_filename = REAL_DATA if namespace.real else TEST_DATA
     log_level = logging.DEBUG if namespace.verbose else logging.INFO
     logging.basicConfig(level=log_level)
+    if namespace.verbose:
+        trace.enable()
 
     return namespace
 
@@ -71,6 +78,7 @@ def read_data(input_filename: str):
         return f.read()
 
 
+@cache_payload
 def load_data(namespace) -> list[str]:
     if namespace.custom:
         text_data = "noop\naddx 3\naddx -5"
@@ -136,22 +144,29 @@ def compute1(records: list[dict]) -> int:
     targets = [r["targets"] for r in records]
     count = len(records)
     activity = [0 for _ in range(count)]
+    tracing = trace.enabled
 
     for round in range(1, 20+1):
         for m in range(count):
             items = monkey_items[m]
             monkey_items[m] = []
-            logging.debug(f"{m=} {items=}")
+            if tracing:
+                trace.event("m=%d items=%s", m, items)
             for item in items:
                 activity[m] += 1
                 worry_level = ops[m](item) // 3
                 divisible = (worry_level % div_bys[m]) == 0
                 target = targets[m][int(divisible)]
-                logging.debug(f"{round=}: {m=} {worry_level=} {divisible=} {target=}")
+                if tracing:
+                    trace.event("round=%d: m=%d worry_level=%d divisible=%s "
+                                "target=%d", round, m, worry_level,
+                                divisible, target)
                 monkey_items[target].append(worry_level)
-        logging.debug(f"Finished {round=}")
-        for m, items in enumerate(monkey_items):
-            logging.debug(f"{m=} {items=} activity={activity[m]}")
+        if tracing:
+            trace.event("Finished round=%d", round)
+            for m, items in enumerate(monkey_items):
+                trace.event("m=%d items=%s activity=%d",
+                            m, items, activity[m])
 
     return math.prod(sorted(activity, reverse=True)[:2])
 
@@ -165,18 +180,23 @@ def compute2(records: list[dict], rounds=10000) -> int:
     targets = [r["targets"] for r in records]
     count = len(records)
     activity = [0 for _ in range(count)]
+    tracing = trace.enabled
 
     for round in range(1, rounds+1):
         for m in range(count):
             items = monkey_items[m]
             monkey_items[m] = []
-            logging.debug(f"{m=} {items=}")
+            if tracing:
+                trace.event("m=%d items=%s", m, items)
             for item in items:
                 activity[m] += 1
                 worry_level = ops[m](item)
                 divisible = (worry_level % div_bys[m]) == 0
                 target = targets[m][int(divisible)]
-                logging.debug(f"{round=}: {m=} {worry_level=} {divisible=} {target=}")
+                if tracing:
+                    trace.event("round=%d: m=%d worry_level=%d divisible=%s "
+                                "target=%d", round, m, worry_level,
+                                divisible, target)
                 monkey_items[target].append(worry_level % modulo)
         if round in {1, 20} or round % 1000 == 0:
             logging.info(f"Finished {round=}")
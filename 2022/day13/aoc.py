@@ -15,6 +15,11 @@ import math
 import operator
 import os
 import pprint
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from aoclib import trace
+from aoclib.cache import cache_payload
 
 
 TEST_DATA = "test_input.txt"
@@ -56,6 +61,8 @@ def parse_args() -> argparse.Namespace:
         namespace.input_filename = REAL_DATA if namespace.real else TEST_DATA
     log_level = logging.DEBUG if namespace.verbose else logging.INFO
     logging.basicConfig(level=log_level)
+    if namespace.verbose:
+        trace.enable()
 
     return namespace
 
@@ -70,6 +77,7 @@ def read_data(input_filename: str):
         return f.read()
 
 
+@cache_payload
 def load_data(namespace) -> list[str]:
     if namespace.custom:
         text_data = "noop\naddx 3\naddx -5"
@@ -91,43 +99,57 @@ def parse_data(text_data: str) -> list[str]:
 
 
 def compare(l1, l2, level=0) -> int:
-    indent = " " * 4 * level
-    logging.debug(f"{indent}compare({l1=!r} (len={len(l1)}), "
-                  f"{l2=!r} (len={len(l2)}), {level=})")
-    indent += " " * 4
+    tracing = trace.enabled
+    if tracing:
+        indent = " " * 4 * level
+        trace.event("%scompare(l1=%r (len=%d), l2=%r (len=%d), level=%d)",
+                    indent, l1, len(l1), l2, len(l2), level)
+        indent += " " * 4
     level += 1
 
     for l, r in zip(l1, l2):
-        logging.debug(f"{indent}> {l=!r} {r=!r}")
+        if tracing:
+            trace.event("%s> l=%r r=%r", indent, l, r)
         if isinstance(l, int):
             if isinstance(r, int):
                 if (cmp := l - r) != 0:
-                    logging.debug(f"{indent} {l=!r} <> {r=!r} {cmp=}")
+                    if tracing:
+                        trace.event("%s l=%r <> r=%r cmp=%d",
+                                    indent, l, r, cmp)
                     return cmp
             elif isinstance(r, list):
                 if (cmp := compare([l], r, level)) != 0:
-                    logging.debug(f"{indent} abort {l=!r} {r=!r} {cmp=}")
+                    if tracing:
+                        trace.event("%s abort l=%r r=%r cmp=%d",
+                                    indent, l, r, cmp)
                     return cmp
             else:
                 assert False, f"{l=!r} {r=!r}"
         elif isinstance(r, int):
             if isinstance(l, int):
                 if (cmp := l - r) != 0:
-                    logging.debug(f"{indent} {l=!r} <> {r=!r} {cmp=}")
+                    if tracing:
+                        trace.event("%s l=%r <> r=%r cmp=%d",
+                                    indent, l, r, cmp)
                     return cmp
             elif isinstance(l, list):
                 if (cmp := compare(l, [r], level)) != 0:
-                    logging.debug(f"{indent} abort {l=!r} {r=!r} {cmp=}")
+                    if tracing:
+                        trace.event("%s abort l=%r r=%r cmp=%d",
+                                    indent, l, r, cmp)
                     return cmp
             else:
                 assert False, f"{l=!r} {r=!r}"
         else:
             assert isinstance(l, list) and isinstance(r, list)
             if (cmp := compare(l, r, level)) != 0:
-                logging.debug(f"{indent} abort {l=!r} {r=!r}")
+                if tracing:
+                    trace.event("%s abort l=%r r=%r", indent, l, r)
                 return cmp
     cmp = len(l1) - len(l2)
-    logging.debug(f"{indent} len(l1)={len(l1)} len(l2)={len(l2)} {cmp=}")
+    if tracing:
+        trace.event("%s len(l1)=%d len(l2)=%d cmp=%d",
+                    indent, len(l1), len(l2), cmp)
     return cmp
 
 
@@ -135,7 +157,7 @@ def compute1(packet_pairs: tuple[list]) -> int:
     total = 0
     for i, (l, r) in enumerate(packet_pairs, 1):
         ordered = compare(l, r, 0) < 0
-        logging.info(f"{i=} {l=!r} {r=!r} {ordered=}\n")
+        logging.info("i=%d l=%r r=%r ordered=%s\n", i, l, r, ordered)
         total += i if ordered else 0
     return total
 
@@ -148,7 +170,8 @@ def compute2(packet_pairs: tuple[list]) -> int:
     packets = sorted(packets, key=functools.cmp_to_key(compare))
     index2 = packets.index(DIV2) + 1
     index6 = packets.index(DIV6) + 1
-    logging.debug(f"{packets=}")
+    if trace.enabled:
+        trace.event("packets=%r", packets)
     logging.info(f"{index2=}, {index6=}")
     return index2 * index6
     
@@ -15,6 +15,10 @@ import math
 import operator
 import os
 import pprint
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from aoclib.grid import Grid
 
 
 TEST_DATA = "test_input.txt"
@@ -120,17 +124,13 @@ def _range(p1, p2):
 
 
 ORIGIN_X, ORIGIN_Y = 500, 0
+AIR, ROCK, SAND, SOURCE, WALL = (ord(c) for c in ".#o+@")
 
 
-def draw_paths(paths, min_x, min_y, max_x, max_y):
-    w = max_x - min_x + 1 + 2
-    h = max_y - min_y + 1 + 2
-    grid = [["." for _ in range(w)] for _ in range(h)]
-    for x in range(w):
-        grid[0][x] = grid[h-1][x] = "@"
-    for y in range(h):
-        grid[y][0] = grid[y][w-1] = "@"
-    grid[ORIGIN_Y - min_y + 1][ORIGIN_X - min_x + 1] = "+"
+def draw_paths(paths, min_x, min_y, max_x, max_y) -> Grid:
+    grid = Grid(max_x - min_x + 1, max_y - min_y + 1,
+                fill=AIR, border=WALL, text=True)
+    grid[ORIGIN_Y - min_y, ORIGIN_X - min_x] = SOURCE
     for path in paths:
         sx, sy = path[0]
         for tx, ty in path[1:]:
@@ -139,43 +139,42 @@ def draw_paths(paths, min_x, min_y, max_x, max_y):
                 assert sy == ty
                 for x in _range(sx, tx):
                     # logging.debug(f"{sx=} {tx=} {x=} {x - min_x} {w=}")
-                    grid[sy - min_y + 1][x - min_x + 1] = "#"
+                    grid[sy - min_y, x - min_x] = ROCK
             else:
                 for y in _range(sy, ty):
                     # logging.debug(f"{sy=} {ty=} {y=} {y - min_y} {h=}")
-                    grid[y - min_y + 1][sx - min_x + 1] = "#"
+                    grid[y - min_y, sx - min_x] = ROCK
             sx, sy = tx, ty
     return grid
 
 
 def compute1(paths: list) -> int:
     min_x, min_y, max_x, max_y = bounding_box(paths)
-    w = max_x - min_x + 1 + 2
-    h = max_y - min_y + 1 + 2
     logging.debug(f"{min_x=}, {min_y=}, {max_x=}, {max_y=}")
     grid = draw_paths(paths, min_x, min_y, max_x, max_y)
     print(grid_to_str(grid))
+    cells, below = grid.cells, grid.stride
+    origin = grid.index(ORIGIN_Y - min_y, ORIGIN_X - min_x)
 
     more = True
     sand = 1
     while more:
-        x, y = ORIGIN_X - min_x, ORIGIN_Y - min_y
-        grid[y + 1][x + 1] = "o"
+        i = origin
+        cells[i] = SAND
         while more:
-            assert y + 1 < h
-            y1 = y + 1 + 1
             for dx in (0, -1, +1):
-                x1 = x + 1 + dx
-                if grid[y1][x1] == "@":
+                j = i + below + dx
+                if cells[j] == WALL:
                     more = False
                     break
-                if grid[y1][x1] == ".":
-                    grid[y + 1][x + 1] = "." if y else "+"
-                    x, y = x + dx, y + 1
-                    grid[y + 1][x + 1] = "o"
+                if cells[j] == AIR:
+                    cells[i] = AIR if i != origin else SOURCE
+                    i = j
+                    cells[i] = SAND
                     break
             else:
                 break
+        y, x = grid.coords(i)
         print(f"{sand=} {x=} {y=} {more=}")
         print(grid_to_str(grid))
         if more:
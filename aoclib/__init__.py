@@ -0,0 +1,6 @@
+"""Shared tooling for the per-day Advent of Code solvers.
+
+The solvers under ``YYYY/`` stay standalone scripts; this package finds them,
+imports them without running ``main()``, and drives their
+``load_data``/``compute1``/``compute2`` functions.
+"""
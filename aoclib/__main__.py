@@ -0,0 +1,3 @@
+from aoclib.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,229 @@
+"""Time each day's load, compute1 and compute2 phases separately"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import logging
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from aoclib import cache, generate
+from aoclib.discover import Solver
+from aoclib.solve import (
+    compute_part, has_backend, has_part, load_part, make_namespace)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PHASES = ("load", "part1", "part2")
+METRICS = ("min", "median", "p95")
+
+
+def percentile(times: list[float], pct: float) -> float:
+    """Nearest-rank percentile of times"""
+    ordered = sorted(times)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(times: list[float]) -> dict:
+    return {
+        "reps": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "p95": percentile(times, 95),
+    }
+
+
+def peak_rss_kb() -> int | None:
+    """High-water mark of this process's resident set size"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def bench_phase(solver: Solver, phase: str, reps: int,
+                real: bool = True, input_filename: str | None = None,
+                backend: str = "python") -> dict:
+    """Worker: time one phase reps times in a fresh process.
+
+    Compute phases get a freshly loaded payload for every repetition,
+    since several compute functions mutate their input. The load phase
+    always parses from text; compute phases may take it from the cache.
+    """
+    cache.enabled = phase != "load" and cache.enabled
+    module = solver.load()
+    namespace = make_namespace(module, real, input_filename=input_filename,
+                               backend=backend)
+    part = 1 if phase == "load" else int(phase[-1])
+    year, day = solver.year, solver.day
+    times = []
+    result = None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(reps):
+                if phase == "load":
+                    start = time.perf_counter()
+                    load_part(module, year, day, part, namespace)
+                    times.append(time.perf_counter() - start)
+                else:
+                    payload = load_part(module, year, day, part, namespace)
+                    start = time.perf_counter()
+                    result = compute_part(
+                        module, year, day, part, payload, namespace)
+                    times.append(time.perf_counter() - start)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    stats = summarize(times)
+    stats["peak_rss_kb"] = peak_rss_kb()
+    if phase != "load":
+        stats["result"] = repr(result)
+    return stats
+
+
+def make_jobs(solvers: list[Solver], phases=PHASES,
+              backend: str = "python") -> list[tuple]:
+    """(solver, phase, backend) for each phase to time; parts without
+    their own backend implementation run the Python reference"""
+    jobs = []
+    for solver in solvers:
+        module = solver.load()
+        for phase in phases:
+            if phase == "load":
+                jobs.append((solver, phase, "python"))
+                continue
+            part = int(phase[-1])
+            if has_backend(module, solver.year, solver.day, part, backend):
+                jobs.append((solver, phase, backend))
+            elif has_part(module, solver.year, solver.day, part):
+                jobs.append((solver, phase, "python"))
+    return jobs
+
+
+def job_key(solver: Solver, phase: str, backend: str) -> str:
+    key = f"{solver.key}/{phase}"
+    return key if backend == "python" else f"{key}:{backend}"
+
+
+def run(solvers: list[Solver], reps: int = 5, jobs: int = 1,
+        real: bool = True, phases=PHASES,
+        backend: str = "python") -> dict[str, dict]:
+    """Benchmark every phase; each phase runs in its own process so that
+    peak RSS is not inflated by earlier phases"""
+    report = {}
+    with ProcessPoolExecutor(max_workers=jobs,
+                             max_tasks_per_child=1) as executor:
+        futures = {
+            job_key(solver, phase, b): executor.submit(
+                bench_phase, solver, phase, reps, real, None, b)
+            for solver, phase, b in make_jobs(solvers, phases, backend)}
+        for key, future in futures.items():
+            try:
+                report[key] = future.result()
+            except Exception as e:
+                report[key] = {"error": f"{type(e).__name__}: {e}"}
+    return report
+
+
+def load_report(filename: str) -> dict[str, dict]:
+    with open(filename, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_report(report: dict[str, dict], filename: str) -> None:
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+        f.write("\n")
+
+
+def find_regressions(report: dict[str, dict], baseline: dict[str, dict],
+                     threshold: float = 10.0, metric: str = "median",
+                     noise_floor: float = 0.001) -> list[str]:
+    """Phases whose metric grew by more than threshold percent.
+
+    Differences smaller than noise_floor seconds are ignored, so that
+    microsecond phases do not flap.
+    """
+    regressions = []
+    for key, stats in report.items():
+        base = baseline.get(key)
+        if not base or "error" in base or "error" in stats:
+            continue
+        old, new = base[metric], stats[metric]
+        if new > old * (1 + threshold / 100) and new - old > noise_floor:
+            growth = (new / old - 1) * 100 if old else math.inf
+            regressions.append(
+                f"{key}: {metric} {old:.6f}s -> {new:.6f}s (+{growth:.0f}%)")
+    return regressions
+
+
+def fit_exponent(sizes: list[int], times: list[float]) -> float | None:
+    """Least-squares slope of log(time) against log(size): about 1 for
+    linear code, 2 for quadratic"""
+    points = [(math.log(n), math.log(t))
+              for n, t in zip(sizes, times) if n > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    if not sxx:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / sxx
+
+
+def scale_phase(solver: Solver, phase: str, reps: int,
+                input_filename: str, backend: str = "python") -> dict:
+    """Worker: time one phase on a generated input, bypassing the cache"""
+    cache.enabled = False
+    return bench_phase(solver, phase, reps, True, input_filename, backend)
+
+
+def run_scaling(solver: Solver, sizes: list[int], reps: int = 3,
+                jobs: int = 1, seed: int = 0, phases=PHASES,
+                metric: str = "median",
+                backend: str = "python") -> dict[str, dict]:
+    """Benchmark every phase on generated inputs of each size, and fit
+    the growth exponent of metric"""
+    cap = generate.MAX_SIZES.get((solver.year, solver.day))
+    if cap is not None and max(sizes) > cap:
+        logging.warning("%s: skipping sizes above %d", solver.key, cap)
+        sizes = [size for size in sizes if size <= cap]
+    report = {}
+    with tempfile.TemporaryDirectory(prefix="aoc-scale-") as tmp:
+        filenames = {}
+        for size in sizes:
+            filenames[size] = os.path.join(
+                tmp, f"{solver.year}-{solver.day:02}-n{size}-s{seed}.txt")
+            generate.write_input(filenames[size], solver.year, solver.day,
+                                 size, seed)
+        with ProcessPoolExecutor(max_workers=jobs,
+                                 max_tasks_per_child=1) as executor:
+            futures = {
+                (job_key(solver, phase, b), size): executor.submit(
+                    scale_phase, solver, phase, reps, filenames[size], b)
+                for _, phase, b in make_jobs([solver], phases, backend)
+                for size in sizes}
+            for (key, size), future in futures.items():
+                try:
+                    stats = future.result()
+                except Exception as e:
+                    stats = {"error": f"{type(e).__name__}: {e}"}
+                entry = report.setdefault(key, {"sizes": {}})
+                entry["sizes"][str(size)] = stats
+    for entry in report.values():
+        good = {int(n): stats[metric] for n, stats in entry["sizes"].items()
+                if "error" not in stats}
+        entry["exponent"] = fit_exponent(list(good), list(good.values()))
+    return report
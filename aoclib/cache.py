@@ -0,0 +1,152 @@
+"""On-disk cache of parsed payloads, keyed by input and solver content.
+
+A warm load skips reading and parsing the text entirely. Every load
+returns a fresh unpickled copy, so a compute1 that mutates its payload
+(2022 day 5, 2021 day 11) cannot affect compute2.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+from types import ModuleType
+from typing import Any, Callable
+
+from aoclib.discover import ROOT
+
+CACHE_DIR = os.environ.get("AOC_CACHE_DIR", os.path.join(ROOT, ".aoc_cache"))
+
+# Set to False (or export AOC_NO_CACHE=1) to always parse from text
+enabled = not os.environ.get("AOC_NO_CACHE")
+
+# digest -> pickled payload, so repeat loads in one process skip the disk
+_blobs: dict[str, bytes] = {}
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def aoclib_sources(module: ModuleType) -> list[str]:
+    """The files of the aoclib modules that the solver imports from.
+
+    Found through the solver's globals: imported modules (trace) and
+    anything defined in one (Grid, cache_payload).
+    """
+    names = set()
+    for value in vars(module).values():
+        name = (value.__name__ if isinstance(value, ModuleType)
+                else getattr(value, "__module__", None))
+        if isinstance(name, str) and name.split(".")[0] == "aoclib":
+            names.add(name)
+    paths = (getattr(sys.modules.get(name), "__file__", None)
+             for name in names)
+    return sorted(path for path in paths if path)
+
+
+def payload_key(module: ModuleType, input_filename: str) -> str:
+    """SHA-256 over the input file and the solver's source.
+
+    The whole solver file is hashed, not just parse_data, because parsers
+    call helpers (parse_record, to_bin, ...) defined alongside them. So is
+    every aoclib module it imports from, because payloads may be aoclib
+    objects such as Grid, whose pickled layout is defined there.
+    """
+    input_path = os.path.join(os.path.dirname(module.__file__), input_filename)
+    h = hashlib.sha256()
+    h.update(file_digest(input_path).encode())
+    h.update(file_digest(module.__file__).encode())
+    for path in aoclib_sources(module):
+        h.update(file_digest(path).encode())
+    h.update(repr(sys.version_info[:2]).encode())
+    return h.hexdigest()
+
+
+def cache_prefix(module: ModuleType, input_filename: str) -> str:
+    relpath = os.path.relpath(os.path.abspath(module.__file__), ROOT)
+    solver = os.path.splitext(relpath)[0].replace(os.sep, "-")
+    return f"{solver}-{os.path.basename(input_filename)}"
+
+
+def cache_path(module: ModuleType, input_filename: str, key: str) -> str:
+    prefix = cache_prefix(module, input_filename)
+    return os.path.join(CACHE_DIR, f"{prefix}-{key[:32]}.pickle")
+
+
+def prune(module: ModuleType, input_filename: str, keep: str) -> None:
+    """Remove entries left over from earlier versions of the same input
+    or solver"""
+    prefix = cache_prefix(module, input_filename) + "-"
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if (name.startswith(prefix) and name.endswith(".pickle")
+                and path != keep
+                and len(name) == len(prefix) + 32 + len(".pickle")):
+            with contextlib.suppress(OSError):
+                os.remove(path)
+
+
+def write_atomic(path: str, blob: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, path)
+
+
+def cached_payload(module: ModuleType, input_filename: str,
+                   load: Callable[[], Any]) -> Any:
+    """Return a private copy of load()'s result, parsing only when the
+    input or the solver has changed since the last run"""
+    if not enabled:
+        return load()
+    key = payload_key(module, input_filename)
+    blob = _blobs.get(key)
+    if blob is None:
+        path = cache_path(module, input_filename, key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            payload = pickle.loads(blob)
+            logging.debug("cache hit: %s", path)
+        except OSError:
+            blob = None
+        except Exception as e:
+            # e.g. a class pickled as __main__.Foo by the standalone script
+            logging.debug("cache: cannot unpickle %s: %s", path, e)
+            blob = None
+        if blob is None:
+            payload = load()
+            try:
+                blob = pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                logging.debug("cache: cannot pickle payload: %s", e)
+                return payload
+            write_atomic(path, blob)
+            prune(module, input_filename, path)
+            logging.debug("cache store: %s", path)
+        _blobs[key] = blob
+        return payload
+    return pickle.loads(blob)
+
+
+def cache_payload(load_data: Callable) -> Callable:
+    """Decorator for a day's load_data(namespace)"""
+    module = sys.modules[load_data.__module__]
+
+    @functools.wraps(load_data)
+    def wrapper(namespace, *args, **kwargs):
+        if args or kwargs or getattr(namespace, "custom", False):
+            return load_data(namespace, *args, **kwargs)
+        return cached_payload(module, namespace.input_filename,
+                              lambda: load_data(namespace))
+
+    wrapper.cached = True
+    return wrapper
@@ -0,0 +1,246 @@
+"""Command-line entry point: python -m aoclib <command>"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from aoclib import bench, generate, runner
+from aoclib.discover import discover
+from aoclib.solve import BACKENDS, backend_available
+
+
+def shorten(text: str, width: int = 60) -> str:
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def int_list(text: str) -> list[int]:
+    return [int(n) for n in text.split(",")]
+
+
+def add_selection_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--year", "-y", type=int_list,
+        help="Comma-separated years (default: all)")
+    parser.add_argument(
+        "--day", "-d", type=int_list,
+        help="Comma-separated days (default: all)")
+    parser.add_argument(
+        "--part", "-p", type=int_list, default=[1, 2],
+        help="Comma-separated parts (default: 1,2)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--test", "-t", dest="real", action="store_false",
+        help="Use each day's TEST_DATA")
+    group.add_argument(
+        "--real", "-r", dest="real", action="store_true",
+        help="Use each day's REAL_DATA")
+    parser.set_defaults(real=True)
+    parser.add_argument(
+        "--backend", "-B", choices=BACKENDS, default="python",
+        help="Use each day's implementation for this backend, where it "
+             "has one (default: %(default)s)")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(
+        prog="aoc", description="AdventOfCode: run many days at once")
+    parser.add_argument(
+        "--verbose", "-v", action="store_true",
+        help="More verbose logging")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="Run compute1/compute2 for many days in parallel")
+    add_selection_args(run_parser)
+    run_parser.add_argument(
+        "--jobs", "-j", type=int, default=os.cpu_count(),
+        help="Worker processes (default: %(default)s)")
+    run_parser.add_argument(
+        "--no-cache", dest="use_cache", action="store_false",
+        help="Always parse inputs from text")
+    run_parser.add_argument(
+        "--profile", "-P", metavar="DIR",
+        help="Profile each compute with cProfile and tracemalloc, "
+             "writing YYYY-DD-partN-BACKEND.pstats, .collapsed and "
+             ".alloc.txt files to DIR")
+    run_parser.add_argument(
+        "--check-backends", action="store_true",
+        help="Also run every part that has a --backend implementation "
+             "with the Python reference, and fail if they disagree")
+    run_parser.set_defaults(func=cmd_run)
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Time load/compute1/compute2 separately")
+    add_selection_args(bench_parser)
+    bench_parser.add_argument(
+        "--reps", "-n", type=int, default=5,
+        help="Repetitions per phase (default: %(default)s)")
+    bench_parser.add_argument(
+        "--jobs", "-j", type=int, default=1,
+        help="Phases to time concurrently (default: %(default)s)")
+    bench_parser.add_argument(
+        "--output", "-o",
+        help="Write the JSON report here instead of stdout")
+    bench_parser.add_argument(
+        "--baseline", "-b",
+        help="Compare against this earlier JSON report")
+    bench_parser.add_argument(
+        "--threshold", type=float, default=10.0,
+        help="Allowed slowdown in percent (default: %(default)s)")
+    bench_parser.add_argument(
+        "--metric", choices=bench.METRICS, default="median",
+        help="Statistic to compare (default: %(default)s)")
+    bench_parser.add_argument(
+        "--noise-floor", type=float, default=0.001,
+        help="Ignore slowdowns smaller than this many seconds "
+             "(default: %(default)s)")
+    bench_parser.set_defaults(func=cmd_bench)
+
+    gen_parser = subparsers.add_parser(
+        "gen", help="Write a synthetic input of a given size")
+    gen_parser.add_argument(
+        "--year", "-y", type=int, required=True, help="Year")
+    gen_parser.add_argument(
+        "--day", "-d", type=int, required=True, help="Day")
+    gen_parser.add_argument(
+        "--size", "-n", type=int, required=True,
+        help="Input size; the unit depends on the day")
+    gen_parser.add_argument(
+        "--seed", "-s", type=int, default=0,
+        help="Random seed (default: %(default)s)")
+    gen_parser.add_argument(
+        "--output", "-o",
+        help="Write the input here instead of stdout")
+    gen_parser.set_defaults(func=cmd_gen)
+
+    scale_parser = subparsers.add_parser(
+        "scale", help="Time each phase on synthetic inputs of growing size")
+    add_selection_args(scale_parser)
+    scale_parser.add_argument(
+        "--sizes", type=int_list, default=[1000, 10000, 100000],
+        help="Comma-separated input sizes (default: 1000,10000,100000)")
+    scale_parser.add_argument(
+        "--seed", "-s", type=int, default=0,
+        help="Random seed (default: %(default)s)")
+    scale_parser.add_argument(
+        "--reps", "-n", type=int, default=3,
+        help="Repetitions per phase and size (default: %(default)s)")
+    scale_parser.add_argument(
+        "--jobs", "-j", type=int, default=1,
+        help="Phases to time concurrently (default: %(default)s)")
+    scale_parser.add_argument(
+        "--metric", choices=bench.METRICS, default="median",
+        help="Statistic to fit the growth exponent to "
+             "(default: %(default)s)")
+    scale_parser.add_argument(
+        "--output", "-o",
+        help="Also write the JSON report here")
+    scale_parser.set_defaults(func=cmd_scale)
+
+    namespace = parser.parse_args(argv)
+    if (getattr(namespace, "backend", "python") != "python"
+            and not backend_available(namespace.backend)):
+        parser.error(f"--backend {namespace.backend} is not installed")
+    log_level = logging.DEBUG if namespace.verbose else logging.WARNING
+    logging.basicConfig(level=log_level)
+    return namespace
+
+
+def cmd_run(namespace: argparse.Namespace) -> int:
+    solvers = discover(namespace.year, namespace.day)
+    backends = [namespace.backend]
+    if namespace.check_backends:
+        backends = ["python"] + [b for b in BACKENDS
+                                 if b != "python" and backend_available(b)]
+    start = time.perf_counter()
+    results = runner.run(solvers, namespace.jobs, namespace.real,
+                         namespace.part, namespace.verbose,
+                         namespace.use_cache, namespace.profile, backends)
+    wall = time.perf_counter() - start
+
+    failures = 0
+    for r in results:
+        if r.error:
+            failures += 1
+            print(f"{r.key}: FAILED {shorten(r.error)}")
+        else:
+            print(f"{r.key}: {shorten(r.result)} ({r.elapsed:.3f}s)")
+        if namespace.verbose and r.output:
+            sys.stdout.write(r.output)
+    for line in runner.disagreements(results):
+        failures += 1
+        print(f"BACKENDS DISAGREE {shorten(line, 120)}")
+    if namespace.profile:
+        print(f"Profiles written to {namespace.profile}")
+    total = sum(r.elapsed for r in results)
+    print(f"{len(results)} parts, {failures} failed: "
+          f"wall={wall:.3f}s sum={total:.3f}s jobs={namespace.jobs}")
+    return 1 if failures else 0
+
+
+def cmd_bench(namespace: argparse.Namespace) -> int:
+    solvers = discover(namespace.year, namespace.day)
+    phases = ["load"] + [f"part{p}" for p in namespace.part]
+    report = bench.run(solvers, namespace.reps, namespace.jobs,
+                       namespace.real, phases, namespace.backend)
+    if namespace.output:
+        bench.save_report(report, namespace.output)
+    else:
+        json.dump(report, sys.stdout, indent=4)
+        print()
+
+    if not namespace.baseline:
+        return 0
+    regressions = bench.find_regressions(
+        report, bench.load_report(namespace.baseline), namespace.threshold,
+        namespace.metric, namespace.noise_floor)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def cmd_gen(namespace: argparse.Namespace) -> int:
+    text = generate.generate(namespace.year, namespace.day,
+                             namespace.size, namespace.seed)
+    if namespace.output:
+        with open(namespace.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+def cmd_scale(namespace: argparse.Namespace) -> int:
+    phases = ["load"] + [f"part{p}" for p in namespace.part]
+    report = {}
+    for solver in discover(namespace.year, namespace.day):
+        if (solver.year, solver.day) not in generate.GENERATORS:
+            logging.warning("%s: no input generator", solver.key)
+            continue
+        results = bench.run_scaling(
+            solver, namespace.sizes, namespace.reps, namespace.jobs,
+            namespace.seed, phases, namespace.metric, namespace.backend)
+        for key, entry in results.items():
+            for size, stats in entry["sizes"].items():
+                if "error" in stats:
+                    print(f"{key} n={size}: FAILED {shorten(stats['error'])}")
+                else:
+                    print(f"{key} n={size}: "
+                          f"{namespace.metric}={stats[namespace.metric]:.6f}s")
+            if entry["exponent"] is not None:
+                print(f"{key}: time ~ n^{entry['exponent']:.2f}")
+        report.update(results)
+    if namespace.output:
+        bench.save_report(report, namespace.output)
+    return 0
+
+
+def main(argv=None) -> int:
+    namespace = parse_args(argv)
+    return namespace.func(namespace)
@@ -0,0 +1,92 @@
+"""Find the per-day solver scripts and import them as modules"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import re
+import sys
+from dataclasses import dataclass
+from types import ModuleType
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+YEAR_RE = re.compile(r"^YEAR = (\d+)", re.MULTILINE)
+DAY_RE = re.compile(r"^DAY = (\d+)", re.MULTILINE)
+MAIN_GUARD = 'if __name__ == "__main__":'
+
+
+@dataclass(frozen=True)
+class Solver:
+    """One day's solver script"""
+    year: int
+    day: int
+    path: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.year}/{self.day:02}"
+
+    @property
+    def module_name(self) -> str:
+        return f"aoc{self.year}_day{self.day:02}"
+
+    def load(self) -> ModuleType:
+        return load_module(self.path, self.module_name)
+
+
+def load_module(path: str, name: str) -> ModuleType:
+    """Import the script at path as module name, without running main()"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def scan_source(path: str, default_year: int) -> tuple[int, int] | None:
+    """Return (YEAR, DAY) if path is an importable solver script"""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    # Scripts without a main guard do their work at import time
+    if MAIN_GUARD not in source:
+        return None
+    day_match = DAY_RE.search(source)
+    if not day_match:
+        return None
+    year_match = YEAR_RE.search(source)
+    year = int(year_match.group(1)) if year_match else default_year
+    return year, int(day_match.group(1))
+
+
+def discover(years=None, days=None) -> list[Solver]:
+    """Find solver scripts by their YEAR/DAY constants"""
+    solvers: dict[tuple[int, int], Solver] = {}
+    for year_dir in sorted(os.listdir(ROOT)):
+        year_path = os.path.join(ROOT, year_dir)
+        if not (year_dir.isdigit() and os.path.isdir(year_path)):
+            continue
+        if years and int(year_dir) not in years:
+            continue
+        for day_dir in sorted(os.listdir(year_path)):
+            day_path = os.path.join(year_path, day_dir)
+            if not os.path.isdir(day_path):
+                continue
+            for name in sorted(os.listdir(day_path)):
+                if not name.endswith(".py"):
+                    continue
+                path = os.path.join(day_path, name)
+                found = scan_source(path, int(year_dir))
+                if found is None:
+                    continue
+                year, day = found
+                if days and day not in days:
+                    continue
+                solvers.setdefault((year, day), Solver(year, day, path))
+    return [solvers[k] for k in sorted(solvers)]
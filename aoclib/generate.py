@@ -0,0 +1,729 @@
+"""Seeded generators of large, valid puzzle inputs, for scaling curves.
+
+Every generator is registered as (year, day) and called as gen(rng, size),
+returning the input text. What size counts differs per day and is given
+in each generator's docstring: readings, lines, boards, grid side, ...
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+import string
+from typing import Callable
+
+GenFunc = Callable[[random.Random, int], str]
+
+GENERATORS: dict[tuple[int, int], GenFunc] = {}
+# Largest size worth scaling a day to, where its solver is superlinear
+MAX_SIZES: dict[tuple[int, int], int] = {}
+
+LOWER = string.ascii_lowercase
+UPPER = string.ascii_uppercase
+
+
+def generator(year: int, day: int, max_size: int | None = None):
+    """Register the input generator for a day"""
+    def decorator(func: GenFunc) -> GenFunc:
+        GENERATORS[year, day] = func
+        if max_size is not None:
+            MAX_SIZES[year, day] = max_size
+        return func
+    return decorator
+
+
+def generate(year: int, day: int, size: int, seed: int = 0) -> str:
+    """The input text for (year, day); the same seed gives the same text"""
+    try:
+        func = GENERATORS[year, day]
+    except KeyError:
+        raise ValueError(f"No generator for {year}/{day:02}") from None
+    if size < 1:
+        raise ValueError(f"size must be positive, not {size}")
+    return func(random.Random(f"{year}/{day}/{seed}"), size)
+
+
+def write_input(filename: str, year: int, day: int, size: int,
+                seed: int = 0) -> None:
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(generate(year, day, size, seed))
+
+
+def lines(rows) -> str:
+    return "\n".join(rows) + "\n"
+
+
+def digit_grid(rng: random.Random, side: int, digits: str) -> str:
+    return lines("".join(rng.choices(digits, k=side)) for _ in range(side))
+
+
+def primes():
+    found = []
+    for n in itertools.count(2):
+        if all(n % p for p in found if p * p <= n):
+            found.append(n)
+            yield n
+
+
+# 2021
+
+
+@generator(2021, 1)
+def depths(rng: random.Random, size: int) -> str:
+    """size sonar depth readings, a random walk that stays positive"""
+    depth = rng.randint(100, 200)
+    readings = []
+    for _ in range(size):
+        depth = max(1, depth + rng.randint(-10, 20))
+        readings.append(str(depth))
+    return lines(readings)
+
+
+@generator(2021, 2)
+def dive(rng: random.Random, size: int) -> str:
+    """size submarine commands"""
+    return lines(f"{rng.choice(('forward', 'down', 'down', 'up'))} "
+                 f"{rng.randint(1, 9)}" for _ in range(size))
+
+
+@generator(2021, 3)
+def diagnostic(rng: random.Random, size: int) -> str:
+    """size 12-bit binary numbers"""
+    return lines(f"{rng.getrandbits(12):012b}" for _ in range(size))
+
+
+@generator(2021, 4)
+def bingo(rng: random.Random, size: int) -> str:
+    """Draws of 0-99, then size 5x5 boards; every board eventually wins"""
+    draws = list(range(100))
+    rng.shuffle(draws)
+    blocks = [",".join(map(str, draws))]
+    for _ in range(size):
+        numbers = rng.sample(range(100), 25)
+        blocks.append("\n".join(
+            " ".join(f"{n:2d}" for n in numbers[r * 5:r * 5 + 5])
+            for r in range(5)))
+    return "\n\n".join(blocks) + "\n"
+
+
+@generator(2021, 5)
+def vents(rng: random.Random, size: int) -> str:
+    """size horizontal, vertical or 45-degree lines within 1000x1000"""
+    rows = []
+    for _ in range(size):
+        x1, y1 = rng.randrange(1000), rng.randrange(1000)
+        kind = rng.randrange(3)
+        if kind == 0:
+            x2, y2 = rng.randrange(1000), y1
+        elif kind == 1:
+            x2, y2 = x1, rng.randrange(1000)
+        else:
+            dx, dy = rng.choice((-1, 1)), rng.choice((-1, 1))
+            limit_x = 999 - x1 if dx > 0 else x1
+            limit_y = 999 - y1 if dy > 0 else y1
+            n = rng.randint(0, min(limit_x, limit_y))
+            x2, y2 = x1 + dx * n, y1 + dy * n
+        rows.append(f"{x1},{y1} -> {x2},{y2}")
+    return lines(rows)
+
+
+@generator(2021, 6)
+def lanternfish(rng: random.Random, size: int) -> str:
+    """size fish timers, 1-5"""
+    return ",".join(str(rng.randint(1, 5)) for _ in range(size)) + "\n"
+
+
+@generator(2021, 7)
+def crabs(rng: random.Random, size: int) -> str:
+    """size crab positions, skewed towards 0 like the real input"""
+    return ",".join(str(int(rng.expovariate(1 / 400)) % 2000)
+                    for _ in range(size)) + "\n"
+
+
+DIGIT_SEGMENTS = ("abcefg", "cf", "acdeg", "acdfg", "bcdf",
+                  "abdfg", "abdefg", "acf", "abcdefg", "abcdfg")
+
+
+@generator(2021, 8)
+def seven_segment(rng: random.Random, size: int) -> str:
+    """size displays, each with its own scrambled wiring"""
+    rows = []
+    for _ in range(size):
+        wiring = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+
+        def scramble(digit):
+            wires = [wiring[s] for s in DIGIT_SEGMENTS[digit]]
+            rng.shuffle(wires)
+            return "".join(wires)
+
+        patterns = [scramble(d) for d in rng.sample(range(10), 10)]
+        outputs = [scramble(rng.randrange(10)) for _ in range(4)]
+        rows.append(f"{' '.join(patterns)} | {' '.join(outputs)}")
+    return lines(rows)
+
+
+@generator(2021, 9)
+def heightmap(rng: random.Random, size: int) -> str:
+    """A size x size heightmap, basins walled in by 9s"""
+    return lines("".join("9" if rng.random() < 0.25
+                         else str(rng.randint(0, 8)) for _ in range(size))
+                 for _ in range(size))
+
+
+BRACKETS = {"(": ")", "[": "]", "{": "}", "<": ">"}
+
+
+@generator(2021, 10)
+def navigation(rng: random.Random, size: int) -> str:
+    """size chunk lines, about half corrupted and the rest incomplete"""
+    rows = []
+    for _ in range(size):
+        length = rng.randint(20, 110)
+        stack, chars = [], []
+        corrupt = rng.random() < 0.5
+        while len(chars) < length or not stack:
+            if stack and rng.random() < 0.45:
+                chars.append(BRACKETS[stack.pop()])
+            else:
+                stack.append(rng.choice("([{<"))
+                chars.append(stack[-1])
+        if corrupt:
+            at = rng.randint(len(chars) // 2, len(chars))
+            stack = []
+            for c in chars[:at]:
+                if c in BRACKETS:
+                    stack.append(c)
+                else:
+                    stack.pop()
+            if stack:
+                wrong = [c for c in BRACKETS.values()
+                         if c != BRACKETS[stack[-1]]]
+                chars.insert(at, rng.choice(wrong))
+        rows.append("".join(chars))
+    return lines(rows)
+
+
+@generator(2021, 11)
+def octopuses(rng: random.Random, size: int) -> str:
+    """A size x size grid of energy levels"""
+    return digit_grid(rng, size, "0123456789")
+
+
+def cave_names(rng: random.Random, count: int, letters: str) -> list[str]:
+    names = set()
+    width = 2
+    while len(names) < count:
+        if len(names) >= len(letters) ** width // 2:
+            width += 1
+        name = "".join(rng.choices(letters, k=width))
+        if name not in ("start", "end"):
+            names.add(name)
+    return sorted(names)
+
+
+CAVE_CYCLES = 3     # big caves that close a loop
+
+
+@generator(2021, 12, max_size=10_000)
+def caves(rng: random.Random, size: int) -> str:
+    """size small caves plus about size/4 big caves.
+
+    The small caves form a random tree. Each big cave hangs off one small
+    cave, except CAVE_CYCLES of them, which join two small caves; start
+    and end each join two caves. So the graph has only a fixed number of
+    loops and the number of paths grows polynomially, not exponentially,
+    with size, though part 2 still takes most of a minute at 10,000. Big
+    caves never touch each other, or there would be infinitely many paths.
+    """
+    small = cave_names(rng, size, LOWER)
+    big = cave_names(rng, max(1, size // 4), UPPER)
+    edges = set()
+    for i in range(1, len(small)):
+        edges.add(tuple(sorted((small[i], rng.choice(small[:i])))))
+    for i, cave in enumerate(big):
+        degree = 2 if i < CAVE_CYCLES else 1
+        for other in rng.sample(small, min(degree, len(small))):
+            edges.add(tuple(sorted((cave, other))))
+    for end in ("start", "end"):
+        for cave in rng.sample(small, min(2, len(small))):
+            edges.add((end, cave))
+    edges = sorted(edges)
+    rng.shuffle(edges)
+    return lines(f"{a}-{b}" for a, b in edges)
+
+
+@generator(2021, 13)
+def origami(rng: random.Random, size: int) -> str:
+    """size dots on a sheet that every fold exactly halves"""
+    width, height = 39, 5
+    folds = []
+    while (width + 1) * (height + 1) < 4 * size or len(folds) < 4:
+        if width <= height * 4:
+            folds.append(f"fold along x={width}")
+            width = 2 * width + 1
+        else:
+            folds.append(f"fold along y={height}")
+            height = 2 * height + 1
+    fold_x = {int(f.split("=")[1]) for f in folds if "x=" in f}
+    fold_y = {int(f.split("=")[1]) for f in folds if "y=" in f}
+    # Folds halve the full sheet, so put a dot in its far corner
+    dots = {(width - 1, height - 1)}
+    while len(dots) < size:
+        x, y = rng.randrange(width), rng.randrange(height)
+        if x not in fold_x and y not in fold_y:
+            dots.add((x, y))
+    dots = sorted(dots)
+    rng.shuffle(dots)
+    return (lines(f"{x},{y}" for x, y in dots) + "\n"
+            + lines(reversed(folds)))
+
+
+@generator(2021, 14)
+def polymer(rng: random.Random, size: int) -> str:
+    """A template of size elements and a rule for each of the 100 pairs"""
+    elements = "BCFHKNOPSV"
+    template = "".join(rng.choices(elements, k=size))
+    rules = [f"{a}{b} -> {rng.choice(elements)}"
+             for a in elements for b in elements]
+    return template + "\n\n" + lines(rules)
+
+
+@generator(2021, 15)
+def chitons(rng: random.Random, size: int) -> str:
+    """A size x size grid of risk levels"""
+    return digit_grid(rng, size, "123456789")
+
+
+def literal_bits(rng: random.Random) -> str:
+    value = f"{rng.getrandbits(rng.choice((4, 8, 16, 32))):b}"
+    value = "0" * (-len(value) % 4) + value
+    groups = [value[i:i + 4] for i in range(0, len(value), 4)]
+    return "".join(("1" if i < len(groups) - 1 else "0") + g
+                   for i, g in enumerate(groups))
+
+
+def packet_bits(rng: random.Random, type_id: int,
+                children: list[str]) -> str:
+    header = f"{rng.randrange(8):03b}{type_id:03b}"
+    if type_id == 4:
+        return header + literal_bits(rng)
+    body = "".join(children)
+    if len(body) < 1 << 15 and rng.random() < 0.5:
+        return header + "0" + f"{len(body):015b}" + body
+    return header + "1" + f"{len(children):011b}" + body
+
+
+@generator(2021, 16)
+def bits_transmission(rng: random.Random, size: int) -> str:
+    """One hex transmission of about size nested packets"""
+    # Nodes are [type_id, children]; comparisons take exactly two operands
+    # and a length-type-1 count field holds at most 2047 sub-packets
+    def full(node: list) -> bool:
+        return len(node[1]) >= (2 if node[0] in (5, 6, 7) else 2047)
+
+    root = [rng.choice((0, 1, 2, 3)), []]
+    operators = [root]
+    for _ in range(size - 1):
+        parent = rng.choice(operators)
+        if full(parent):
+            if full(root):
+                root = [rng.choice((0, 1, 2, 3)), [root]]
+                operators.append(root)
+            parent = root
+        if rng.random() < 0.6:
+            child = [4, []]
+        else:
+            child = [rng.choice((0, 1, 2, 3, 5, 6, 7)), []]
+            operators.append(child)
+        parent[1].append(child)
+    for node in operators:
+        while len(node[1]) < (2 if node[0] in (5, 6, 7) else 1):
+            node[1].append([4, []])
+
+    # Encode children before parents, without recursion
+    order, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(node[1])
+    encoded = {}
+    for node in reversed(order):
+        encoded[id(node)] = packet_bits(
+            rng, node[0], [encoded[id(c)] for c in node[1]])
+    bits = encoded[id(root)]
+    bits += "0" * (-len(bits) % 8)
+    return f"{int(bits, 2):0{len(bits) // 4}X}\n"
+
+
+@generator(2021, 17)
+def trick_shot(rng: random.Random, size: int) -> str:
+    """A target area about size units away, below and to the right"""
+    x1 = rng.randint(size, 2 * size)
+    y1 = -rng.randint(size, 2 * size)
+    x2 = x1 + rng.randint(size // 10, size // 5 + 1)
+    y2 = y1 + rng.randint(size // 4, size // 2 + 1)
+    return f"target area: x={x1}..{x2}, y={y1}..{min(y2, -1)}\n"
+
+
+def snailfish_pair(rng: random.Random, level: int) -> str:
+    halves = [str(rng.randint(0, 9)) if level == 4 or rng.random() < 0.3
+              else snailfish_pair(rng, level + 1) for _ in range(2)]
+    return f"[{halves[0]},{halves[1]}]"
+
+
+@generator(2021, 18)
+def snailfish_homework(rng: random.Random, size: int) -> str:
+    """size reduced snailfish numbers, nested at most four pairs deep"""
+    return lines(snailfish_pair(rng, 1) for _ in range(size))
+
+
+# 2022
+
+
+@generator(2022, 1)
+def calories(rng: random.Random, size: int) -> str:
+    """size elves carrying 1-15 snacks each"""
+    return "\n\n".join(
+        "\n".join(str(rng.randint(1000, 60000))
+                  for _ in range(rng.randint(1, 15)))
+        for _ in range(size)) + "\n"
+
+
+@generator(2022, 2)
+def strategy_guide(rng: random.Random, size: int) -> str:
+    """size rounds of rock paper scissors"""
+    return lines(f"{rng.choice('ABC')} {rng.choice('XYZ')}"
+                 for _ in range(size))
+
+
+@generator(2022, 3)
+def rucksacks(rng: random.Random, size: int) -> str:
+    """size rucksacks (rounded up to whole groups of three).
+
+    Each rucksack's halves share exactly one item and each group shares
+    exactly one badge, so every elf gets a disjoint pool of other items.
+    """
+    items = LOWER + UPPER
+    rows = []
+    for _ in range((size + 2) // 3):
+        badge, *rest = rng.sample(items, 52)
+        for elf in range(3):
+            pool = rest[elf * 17:elf * 17 + 17]
+            shared, left, right = pool[0], pool[1:9], pool[9:]
+            k = rng.randint(2, 14)
+            first = [shared, badge] + rng.choices(left, k=k)
+            second = [shared] + rng.choices(right, k=k + 1)
+            rng.shuffle(first)
+            rng.shuffle(second)
+            rows.append("".join(first + second))
+    return lines(rows)
+
+
+@generator(2022, 4)
+def section_pairs(rng: random.Random, size: int) -> str:
+    """size pairs of section ranges within 1-99"""
+    def section():
+        a = rng.randint(1, 99)
+        return f"{a}-{rng.randint(a, 99)}"
+    return lines(f"{section()},{section()}" for _ in range(size))
+
+
+@generator(2022, 5)
+def crates(rng: random.Random, size: int) -> str:
+    """Nine stacks of crates and size moves that never empty a stack"""
+    stacks = [rng.choices(UPPER, k=rng.randint(2, 8)) for _ in range(9)]
+    height = max(len(s) for s in stacks)
+    diagram = []
+    for level in reversed(range(height)):
+        diagram.append(" ".join(f"[{s[level]}]" if level < len(s) else "   "
+                                for s in stacks))
+    diagram.append(" ".join(f" {i} " for i in range(1, 10)))
+    moves = []
+    for _ in range(size):
+        source = rng.choice([i for i, s in enumerate(stacks) if len(s) > 1])
+        target = rng.choice([i for i in range(9) if i != source])
+        n = rng.randint(1, min(len(stacks[source]) - 1, 10))
+        stacks[target] += stacks[source][-n:]
+        del stacks[source][-n:]
+        moves.append(f"move {n} from {source + 1} to {target + 1}")
+    return lines(diagram) + "\n" + lines(moves)
+
+
+@generator(2022, 6)
+def datastream(rng: random.Random, size: int) -> str:
+    """One stream of size characters whose markers come at the very end"""
+    # Three letters can never form a 4-character marker
+    body = rng.choices("abc", k=max(0, size - 14))
+    return "".join(body) + "".join(rng.sample(LOWER, 14)) + "\n"
+
+
+@generator(2022, 7)
+def filesystem(rng: random.Random, size: int) -> str:
+    """A terminal session exploring size directories"""
+    # Build the tree first: dir -> (subdir names, files)
+    children: list[list[int]] = [[]]
+    for d in range(1, size):
+        children[rng.randrange(d)].append(d)
+        children.append([])
+    rows = ["$ cd /"]
+    stack = [(0, iter([]), True)]
+    while stack:
+        d, pending, first = stack.pop()
+        if first:
+            names = cave_names(rng, len(children[d]) + 6, LOWER)
+            rng.shuffle(names)
+            subdirs = dict(zip(children[d], names))
+            rows.append("$ ls")
+            for child, name in subdirs.items():
+                rows.append(f"dir {name}")
+            for name in names[len(children[d]):][:rng.randint(0, 6)]:
+                rows.append(f"{rng.randint(1000, 300000)} {name}.dat")
+            pending = iter(subdirs.items())
+        step = next(pending, None)
+        if step is None:
+            if stack:
+                rows.append("$ cd ..")
+            continue
+        stack.append((d, pending, False))
+        child, name = step
+        rows.append(f"$ cd {name}")
+        stack.append((child, iter([]), True))
+    return lines(rows)
+
+
+@generator(2022, 8)
+def tree_grid(rng: random.Random, size: int) -> str:
+    """A size x size grid of tree heights"""
+    return digit_grid(rng, size, "0123456789")
+
+
+@generator(2022, 9)
+def rope_moves(rng: random.Random, size: int) -> str:
+    """size head motions of 1-20 steps"""
+    return lines(f"{rng.choice('RLUD')} {rng.randint(1, 20)}"
+                 for _ in range(size))
+
+
+@generator(2022, 10)
+def cpu_program(rng: random.Random, size: int) -> str:
+    """size noop/addx instructions, keeping X within the CRT"""
+    rows = []
+    x = 1
+    for _ in range(size):
+        if rng.random() < 0.3:
+            rows.append("noop")
+        else:
+            v = rng.randint(max(-10, -x), min(10, 39 - x)) or 1
+            x += v
+            rows.append(f"addx {v}")
+    return lines(rows)
+
+
+@generator(2022, 11)
+def monkeys(rng: random.Random, size: int) -> str:
+    """size monkeys, each testing divisibility by a distinct prime"""
+    if size < 2:
+        raise ValueError("Need at least two monkeys")
+    divisors = list(itertools.islice(primes(), size))
+    rng.shuffle(divisors)
+    stanzas = []
+    for m, div_by in enumerate(divisors):
+        items = ", ".join(str(rng.randint(50, 99))
+                          for _ in range(rng.randint(1, 8)))
+        op = rng.choice(("* old", f"* {rng.randint(2, 19)}",
+                         f"+ {rng.randint(1, 8)}", f"+ {rng.randint(1, 8)}"))
+        if_true = if_false = m
+        while if_true == m:
+            if_true = rng.randrange(size)
+        while if_false == m or (if_false == if_true and size > 2):
+            if_false = rng.randrange(size)
+        stanzas.append(
+            f"Monkey {m}:\n"
+            f"  Starting items: {items}\n"
+            f"  Operation: new = old {op}\n"
+            f"  Test: divisible by {div_by}\n"
+            f"    If true: throw to monkey {if_true}\n"
+            f"    If false: throw to monkey {if_false}")
+    return "\n\n".join(stanzas) + "\n"
+
+
+@generator(2022, 12)
+def hill_climb(rng: random.Random, size: int) -> str:
+    """A heightmap size wide and size/5 tall, rising from S to E.
+
+    Heights rise by at most one per column, and the top row is left
+    unperturbed, so E is always reachable.
+    """
+    width, height = max(size, 27), max(size // 5, 2)
+    rows = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            h = x * 26 // width
+            if y and rng.random() < 0.3:
+                h = max(0, h - rng.randint(1, 3))
+            row.append(LOWER[h])
+        rows.append(row)
+    rows[0][0] = "S"
+    rows[0][-1] = "E"
+    return lines("".join(row) for row in rows)
+
+
+def random_packet(rng: random.Random, depth: int = 0):
+    if depth > 3 or rng.random() < 0.3:
+        return rng.randint(0, 10)
+    return [random_packet(rng, depth + 1) for _ in range(rng.randint(0, 5))]
+
+
+@generator(2022, 13)
+def packet_pairs(rng: random.Random, size: int) -> str:
+    """size pairs of nested-list packets"""
+    def packet():
+        p = random_packet(rng)
+        return str(p if isinstance(p, list) else [p]).replace(" ", "")
+    return "\n\n".join(f"{packet()}\n{packet()}"
+                       for _ in range(size)) + "\n"
+
+
+@generator(2022, 14)
+def rock_paths(rng: random.Random, size: int) -> str:
+    """size rock paths of 2-6 straight segments under the sand source"""
+    depth = 20 + size
+    rows = []
+    for _ in range(size):
+        x, y = rng.randint(500 - depth, 500 + depth), rng.randint(10, depth)
+        points = [(x, y)]
+        for i in range(rng.randint(2, 6)):
+            step = rng.choice((-1, 1)) * rng.randint(1, 6)
+            if i % 2 and 10 <= y + step <= depth:
+                y += step
+            else:
+                x += step
+            points.append((x, y))
+        rows.append(" -> ".join(f"{x},{y}" for x, y in points))
+    return lines(rows)
+
+
+@generator(2022, 15)
+def sensors(rng: random.Random, size: int) -> str:
+    """size sensors in 0..4000000, each reporting its closest beacon"""
+    beacons = [(rng.randint(0, 4_000_000), rng.randint(0, 4_000_000))
+               for _ in range(max(1, size // 3))]
+    rows = []
+    for _ in range(size):
+        sx, sy = rng.randint(0, 4_000_000), rng.randint(0, 4_000_000)
+        bx, by = min(beacons, key=lambda b: abs(b[0] - sx) + abs(b[1] - sy))
+        rows.append(f"Sensor at x={sx}, y={sy}: "
+                    f"closest beacon is at x={bx}, y={by}")
+    return lines(rows)
+
+
+@generator(2022, 16)
+def valves(rng: random.Random, size: int) -> str:
+    """size valves in one connected tunnel network, starting at AA"""
+    names = ["".join(p) for p in itertools.product(UPPER, repeat=2)]
+    if size > len(names):
+        raise ValueError(f"At most {len(names)} valves")
+    names.remove("AA")
+    names = ["AA"] + rng.sample(names, size - 1)
+    tunnels: dict[str, set[str]] = {name: set() for name in names}
+    for i in range(1, size):
+        other = names[rng.randrange(i)]
+        tunnels[names[i]].add(other)
+        tunnels[other].add(names[i])
+    for _ in range(size // 3):
+        a, b = rng.sample(names, 2) if size > 1 else ("AA", "AA")
+        if a != b:
+            tunnels[a].add(b)
+            tunnels[b].add(a)
+    rows = []
+    for name in names:
+        rate = 0 if name == "AA" or rng.random() < 0.6 else rng.randint(1, 25)
+        leads = sorted(tunnels[name])
+        if len(leads) == 1:
+            where = f"tunnel leads to valve {leads[0]}"
+        else:
+            where = f"tunnels lead to valves {', '.join(leads)}"
+        rows.append(f"Valve {name} has flow rate={rate}; {where}")
+    return lines(rows)
+
+
+@generator(2022, 17)
+def jets(rng: random.Random, size: int) -> str:
+    """A jet pattern of size pushes"""
+    return "".join(rng.choices("<>", k=size)) + "\n"
+
+
+@generator(2022, 18)
+def droplet(rng: random.Random, size: int) -> str:
+    """size distinct unit cubes packed into a box about twice their
+    volume"""
+    side = max(2, round((2 * size) ** (1 / 3)))
+    if size > side ** 3:
+        side += 1
+    cubes = rng.sample(range(side ** 3), size)
+    return lines(f"{c // side // side},{c // side % side},{c % side}"
+                 for c in cubes)
+
+
+@generator(2022, 19)
+def blueprints(rng: random.Random, size: int) -> str:
+    """size robot blueprints"""
+    return lines(
+        f"Blueprint {i}: "
+        f"Each ore robot costs {rng.randint(2, 4)} ore. "
+        f"Each clay robot costs {rng.randint(2, 4)} ore. "
+        f"Each obsidian robot costs {rng.randint(2, 4)} ore "
+        f"and {rng.randint(5, 20)} clay. "
+        f"Each geode robot costs {rng.randint(2, 4)} ore "
+        f"and {rng.randint(5, 20)} obsidian."
+        for i in range(1, size + 1))
+
+
+@generator(2022, 20)
+def encrypted_file(rng: random.Random, size: int) -> str:
+    """size numbers with duplicates, exactly one of them 0"""
+    numbers = [rng.choice((-1, 1)) * rng.randint(1, 10000)
+               for _ in range(size - 1)]
+    numbers.insert(rng.randint(0, len(numbers)), 0)
+    return lines(map(str, numbers))
+
+
+# 2023
+
+
+SPELLED = ("one", "two", "three", "four", "five",
+           "six", "seven", "eight", "nine")
+
+
+@generator(2023, 1)
+def calibration(rng: random.Random, size: int) -> str:
+    """size calibration lines mixing letters, digits and spelled digits.
+
+    Every line has at least one digit, as part 1 requires.
+    """
+    rows = []
+    for _ in range(size):
+        pieces = [rng.choice("123456789")]
+        for _ in range(rng.randint(1, 8)):
+            kind = rng.randrange(3)
+            if kind == 0:
+                pieces.append(rng.choice("123456789"))
+            elif kind == 1:
+                pieces.append(rng.choice(SPELLED))
+            else:
+                pieces.append("".join(rng.choices(LOWER, k=rng.randint(1, 4))))
+        rng.shuffle(pieces)
+        rows.append("".join(pieces))
+    return lines(rows)
+
+
+# 2025
+
+
+@generator(2025, 1)
+def dial_rotations(rng: random.Random, size: int) -> str:
+    """size dial rotations of 1-999 clicks"""
+    return lines(f"{rng.choice('LR')}"
+                 f"{rng.randint(1, 99) if rng.random() < 0.9 else rng.randint(100, 999)}"
+                 for _ in range(size))
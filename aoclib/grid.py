@@ -0,0 +1,164 @@
+"""A compact 2D grid of small ints in one flat row-major buffer.
+
+Cells live in a bytearray (or an array.array for wider values), so a
+1000x1000 grid costs a megabyte instead of a list of lists of boxed ints.
+Hot loops work on flat offsets::
+
+    cells, n4 = grid.cells, grid.n4
+    for i in grid.positions():
+        if all(cells[i] < cells[i + d] for d in n4):
+            ...
+
+With border set, the buffer has a one-cell frame holding that value, so
+i + d is always a valid offset and the loop needs no bounds checks.
+Without a border, the caller must check bounds itself.
+
+Iterating yields the rows, so the days' grid_to_str() works unchanged:
+memoryviews of ints, or strings for text grids.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Iterator, Sequence
+
+# 0-9 as the bytes b"0"-b"9" -> 0-9
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+def code(value: int | str) -> int:
+    """A text grid's character as the int it is stored as"""
+    return ord(value) if isinstance(value, str) else value
+
+
+class Grid:
+    """width x height cells, optionally framed by a sentinel border"""
+
+    __slots__ = ("width", "height", "border", "pad", "stride", "origin",
+                 "text", "cells", "n4", "n8")
+
+    def __init__(self, width: int, height: int, fill: int | str = 0,
+                 border: int | str | None = None, typecode: str = "B",
+                 text: bool = False):
+        self.width, self.height = width, height
+        self.border = None if border is None else code(border)
+        self.pad = 0 if border is None else 1
+        self.stride = stride = width + 2 * self.pad
+        self.origin = self.pad * (stride + 1)
+        self.text = text
+        size = stride * (height + 2 * self.pad)
+        if typecode == "B":
+            self.cells = bytearray([code(fill)]) * size
+        else:
+            self.cells = array(typecode, [code(fill)]) * size
+        if border is not None:
+            cells = self.cells
+            for c in range(stride):
+                cells[c] = cells[size - stride + c] = self.border
+            for start in range(stride, size - stride, stride):
+                cells[start] = cells[start + stride - 1] = self.border
+        self.n4 = (-stride, -1, +1, stride)
+        self.n8 = (-stride - 1, -stride, -stride + 1, -1,
+                   +1, stride - 1, stride, stride + 1)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]],
+                  border: int | None = None, typecode: str = "B") -> Grid:
+        grid = cls(len(rows[0]) if rows else 0, len(rows),
+                   border=border, typecode=typecode)
+        for r, row in enumerate(rows):
+            start = grid.index(r, 0)
+            grid.cells[start:start + grid.width] = (
+                bytearray(row) if typecode == "B" else array(typecode, row))
+        return grid
+
+    @classmethod
+    def from_digits(cls, lines: Iterable[str],
+                    border: int | None = None) -> Grid:
+        """A grid of 0-9 from lines like "2199943210" """
+        return cls._from_bytes(
+            [line.strip().encode().translate(DIGITS) for line in lines
+             if line.strip()], border, text=False)
+
+    @classmethod
+    def from_text(cls, lines: Iterable[str],
+                  border: str | None = None) -> Grid:
+        """A text grid, one ASCII character per cell"""
+        return cls._from_bytes(
+            [line.rstrip("\n").encode() for line in lines if line.strip()],
+            border, text=True)
+
+    @classmethod
+    def _from_bytes(cls, rows: list[bytes], border, text: bool) -> Grid:
+        grid = cls(len(rows[0]) if rows else 0, len(rows), border=border,
+                   text=text)
+        for r, row in enumerate(rows):
+            start = grid.index(r, 0)
+            grid.cells[start:start + grid.width] = row
+        return grid
+
+    def index(self, r: int, c: int) -> int:
+        """Flat offset of row r, column c"""
+        return self.origin + r * self.stride + c
+
+    def coords(self, i: int) -> tuple[int, int]:
+        """(row, column) of flat offset i"""
+        r, c = divmod(i, self.stride)
+        return r - self.pad, c - self.pad
+
+    def positions(self) -> Iterator[int]:
+        """Flat offsets of every cell inside the border, row by row"""
+        for r in range(self.height):
+            start = self.index(r, 0)
+            yield from range(start, start + self.width)
+
+    def row(self, r: int) -> memoryview:
+        """Zero-copy view of row r, without the border"""
+        start = self.index(r, 0)
+        return memoryview(self.cells)[start:start + self.width]
+
+    def count(self, value: int | str) -> int:
+        """Number of cells inside the border equal to value"""
+        if self.border is None:
+            return self.cells.count(code(value))
+        return sum(self.row(r).tolist().count(code(value))
+                   for r in range(self.height))
+
+    def to_numpy(self):
+        """Zero-copy 2D NumPy view of the cells inside the border"""
+        import numpy as np
+        dtype = (np.uint8 if isinstance(self.cells, bytearray)
+                 else self.cells.typecode)
+        full = np.frombuffer(self.cells, dtype=dtype).reshape(-1, self.stride)
+        pad = self.pad
+        return full[pad:pad + self.height, pad:pad + self.width]
+
+    def copy(self) -> Grid:
+        grid = object.__new__(Grid)
+        for name in Grid.__slots__:
+            setattr(grid, name, getattr(self, name))
+        grid.cells = self.cells[:]
+        return grid
+
+    def display_row(self, r: int) -> memoryview | str:
+        view = self.row(r)
+        return view.tobytes().decode("latin-1") if self.text else view
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            return self.cells[self.index(*key)]
+        if isinstance(key, slice):
+            return [self.display_row(r) for r in range(self.height)[key]]
+        return self.row(range(self.height)[key])
+
+    def __setitem__(self, key: tuple[int, int], value: int | str) -> None:
+        self.cells[self.index(*key)] = code(value)
+
+    def __iter__(self) -> Iterator[memoryview | str]:
+        return (self.display_row(r) for r in range(self.height))
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __repr__(self) -> str:
+        return f"Grid({self.width}x{self.height})"
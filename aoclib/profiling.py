@@ -0,0 +1,103 @@
+"""Profile one compute phase with cProfile and tracemalloc.
+
+For each phase this writes, under the chosen directory, files named
+after the day, part and backend, e.g. 2021-05-part2-python:
+
+    YYYY-DD-partN-BACKEND.pstats     cProfile data, for pstats or snakeviz
+    YYYY-DD-partN-BACKEND.collapsed  "a;b;c microseconds" lines for
+                                     flamegraph.pl or speedscope
+    YYYY-DD-partN-BACKEND.alloc.txt  peak traced memory and the top
+                                     allocation sites
+"""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import tracemalloc
+from typing import Any, Callable
+
+FuncKey = tuple[str, int, str]
+
+
+def label(func: FuncKey) -> str:
+    filename, line, name = func
+    if filename == "~":
+        # Built-ins are reported as ('~', 0, '<built-in method ...>')
+        return name.replace(" ", "_").replace(";", ",")
+    return f"{name}({os.path.basename(filename)}:{line})".replace(" ", "_")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> list[str]:
+    """Flame graph stacks reconstructed from cProfile's caller graph.
+
+    cProfile only records caller -> callee edges, so a function's time is
+    shared among its stacks in proportion to each caller edge's cumulative
+    time. Recursive cycles are cut at the first repeat.
+    """
+    raw = stats.stats
+    callees: dict[FuncKey, list[tuple[FuncKey, float]]] = {}
+    roots = []
+    for func, (_, _, _, _, callers) in raw.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    weights: dict[str, float] = {}
+
+    def walk(func: FuncKey, share: float, stack: list[str]) -> None:
+        _, _, tt, ct, _ = raw[func]
+        stack.append(label(func))
+        frames = ";".join(stack)
+        weights[frames] = weights.get(frames, 0.0) + tt * share
+        for callee, edge_ct in callees.get(func, []):
+            callee_ct = raw[callee][3]
+            if callee_ct <= 0 or label(callee) in stack:
+                continue
+            walk(callee, share * min(1.0, edge_ct / callee_ct), stack)
+        stack.pop()
+
+    for root in roots:
+        walk(root, 1.0, [])
+    return [f"{frames} {round(seconds * 1e6)}"
+            for frames, seconds in sorted(weights.items())
+            if round(seconds * 1e6) > 0]
+
+
+def allocation_report(snapshot: tracemalloc.Snapshot, peak: int,
+                      top: int) -> str:
+    lines = [f"peak traced memory: {peak / 1024:.1f} KiB",
+             f"top {top} allocation sites still live at the end:"]
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8} blocks  "
+                     f"{frame.filename}:{frame.lineno}")
+    return "\n".join(lines) + "\n"
+
+
+def profile_call(func: Callable[[], Any], directory: str, name: str,
+                 top: int = 10) -> Any:
+    """Run func() under cProfile and tracemalloc; write the reports"""
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, name)
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        result = profiler.runcall(func)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    profiler.dump_stats(f"{base}.pstats")
+    stats = pstats.Stats(profiler)
+    with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+        f.writelines(line + "\n" for line in collapsed_stacks(stats))
+    snapshot = snapshot.filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__),
+         tracemalloc.Filter(False, cProfile.__file__)])
+    with open(f"{base}.alloc.txt", "w", encoding="utf-8") as f:
+        f.write(allocation_report(snapshot, peak, top))
+    return result
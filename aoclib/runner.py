@@ -0,0 +1,172 @@
+"""Run many days' parts in a process pool, longest first"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from aoclib import cache
+from aoclib.discover import ROOT, Solver
+from aoclib.profiling import profile_call
+from aoclib.solve import (
+    compute_part, has_backend, has_part, load_part, make_namespace, run_part)
+
+TIMINGS_FILE = os.path.join(ROOT, ".aoc_timings.json")
+
+
+@dataclass
+class Task:
+    solver: Solver
+    part: int
+    real: bool = True
+    use_cache: bool = True
+    profile_dir: str | None = None
+    backend: str = "python"
+
+    @property
+    def key(self) -> str:
+        key = f"{self.solver.key}/{self.part}"
+        return key if self.backend == "python" else f"{key}:{self.backend}"
+
+
+@dataclass
+class TaskResult:
+    key: str
+    result: str | None
+    elapsed: float
+    error: str | None = None
+    output: str = ""
+
+
+def load_timings(filename: str = TIMINGS_FILE) -> dict[str, float]:
+    try:
+        with open(filename, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_timings(timings: dict[str, float],
+                 filename: str = TIMINGS_FILE) -> None:
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(timings.items())), f, indent=4)
+        f.write("\n")
+
+
+def make_tasks(solvers: list[Solver], parts=(1, 2), real: bool = True,
+               use_cache: bool = True, profile_dir: str | None = None,
+               backends=("python",)) -> list[Task]:
+    """One task per (day, part) that the day actually implements.
+
+    A part runs once for each of backends that it implements, and with
+    the Python reference if it implements none of them.
+    """
+    tasks = []
+    for solver in solvers:
+        module = solver.load()
+        for part in parts:
+            if not has_part(module, solver.year, solver.day, part):
+                continue
+            chosen = [b for b in backends if has_backend(
+                module, solver.year, solver.day, part, b)] or ["python"]
+            for backend in chosen:
+                tasks.append(Task(solver, part, real, use_cache,
+                                  profile_dir, backend))
+    return tasks
+
+
+def schedule(tasks: list[Task], timings: dict[str, float]) -> list[Task]:
+    """Longest known runtime first; never-timed tasks go first of all"""
+    return sorted(tasks, key=lambda t: -timings.get(t.key, math.inf))
+
+
+def execute(task: Task, verbose: bool = False) -> TaskResult:
+    """Worker: import the solver and compute one part"""
+    solver = task.solver
+    cache.enabled = task.use_cache
+    module = solver.load()
+    namespace = make_namespace(module, task.real, verbose,
+                               backend=task.backend)
+    output = io.StringIO()
+    year, day, part = solver.year, solver.day, task.part
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            if task.profile_dir:
+                payload = load_part(module, year, day, part, namespace)
+                start = time.perf_counter()
+                result = profile_call(
+                    lambda: compute_part(
+                        module, year, day, part, payload, namespace),
+                    task.profile_dir,
+                    f"{year}-{day:02}-part{part}-{task.backend}")
+            else:
+                result = run_part(module, year, day, part, namespace)
+    except Exception as e:
+        return TaskResult(task.key, None, time.perf_counter() - start,
+                          f"{type(e).__name__}: {e}", output.getvalue())
+    return TaskResult(task.key, repr(result), time.perf_counter() - start,
+                      None, output.getvalue())
+
+
+def run_tasks(tasks: list[Task], jobs: int | None = None,
+              verbose: bool = False) -> list[TaskResult]:
+    """Run tasks across a process pool; results come back in task order"""
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(execute, task, verbose): task
+                   for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                results[task.key] = future.result()
+            except Exception as e:
+                # The worker process died, e.g. a RecursionError took it down
+                results[task.key] = TaskResult(
+                    task.key, None, 0.0, f"{type(e).__name__}: {e}")
+            logging.debug("done %s", task.key)
+    return [results[task.key] for task in tasks]
+
+
+def run(solvers: list[Solver], jobs: int | None = None, real: bool = True,
+        parts=(1, 2), verbose: bool = False,
+        use_cache: bool = True,
+        profile_dir: str | None = None,
+        backends=("python",)) -> list[TaskResult]:
+    timings = load_timings()
+    tasks = schedule(
+        make_tasks(solvers, parts, real, use_cache, profile_dir, backends),
+        timings)
+    results = run_tasks(tasks, jobs, verbose)
+    # Profiled runs are too slow to be representative
+    if real and not profile_dir:
+        for r in results:
+            if r.error is None:
+                timings[r.key] = round(r.elapsed, 6)
+        save_timings(timings)
+    return sorted(results, key=lambda r: r.key)
+
+
+def disagreements(results: list[TaskResult]) -> list[str]:
+    """Parts whose backends gave different answers"""
+    by_part: dict[str, dict[str, TaskResult]] = {}
+    for r in results:
+        part, _, backend = r.key.partition(":")
+        by_part.setdefault(part, {})[backend or "python"] = r
+    problems = []
+    for part, answers in by_part.items():
+        reference = answers.get("python")
+        if reference is None or reference.error:
+            continue
+        for backend, r in answers.items():
+            if r.error is None and r.result != reference.result:
+                problems.append(f"{part}: python={reference.result} "
+                                f"{backend}={r.result}")
+    return problems
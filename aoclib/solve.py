@@ -0,0 +1,272 @@
+"""Call a day's compute1/compute2 the way its main() does"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import importlib.util
+import inspect
+from types import ModuleType
+from typing import Any, Callable
+
+from aoclib import cache
+
+LoadFunc = Callable[[ModuleType, argparse.Namespace], Any]
+PartFunc = Callable[[ModuleType, Any, argparse.Namespace], Any]
+
+# (year, day, part) -> function; None means "no such part"
+SPECIAL_PARTS: dict[tuple[int, int, int], PartFunc | None] = {}
+# (year, day, part) -> loader, for parts that read a different input
+SPECIAL_LOADS: dict[tuple[int, int, int], LoadFunc] = {}
+# (year, day, part) -> name of the function a special part calls, for
+# parts that do not call compute1/compute2
+PART_FUNCS: dict[tuple[int, int, int], str] = {}
+
+# A day implements another backend as <func>_<backend>, beside <func>,
+# with the same signature and answers
+BACKENDS = ("python", "numpy")
+
+
+def special(year: int, day: int, part: int):
+    """Register how to run a part whose main() is not the common pattern"""
+    def decorator(func: PartFunc) -> PartFunc:
+        SPECIAL_PARTS[year, day, part] = func
+        return func
+    return decorator
+
+
+def special_load(year: int, day: int, part: int):
+    """Register how to load the payload for a part"""
+    def decorator(func: LoadFunc) -> LoadFunc:
+        SPECIAL_LOADS[year, day, part] = func
+        return func
+    return decorator
+
+
+def make_namespace(module: ModuleType, real: bool = True,
+                   verbose: bool = False,
+                   input_filename: str | None = None,
+                   backend: str = "python",
+                   jobs: int = 1) -> argparse.Namespace:
+    """The namespace that parse_args() would return by default.
+
+    jobs is 1 rather than a script's own default of one per CPU: runner
+    and bench workers already run side by side, and a pool nested in each
+    would both oversubscribe the CPUs and hide its memory from bench.
+
+    An absolute input_filename replaces the day's own input; the solvers
+    join it onto their directory, which leaves an absolute path alone.
+    """
+    if input_filename is None:
+        input_filename = getattr(
+            module, "REAL_DATA" if real else "TEST_DATA", None)
+    return argparse.Namespace(
+        input_filename=input_filename,
+        real=real,
+        verbose=verbose,
+        custom=False,
+        steps=None,
+        backend=backend,
+        # Worker processes for the days that fan out themselves
+        jobs=jobs,
+    )
+
+
+def load_payload(module: ModuleType, namespace: argparse.Namespace) -> Any:
+    """Read and parse the input, like load_data(), via the payload cache"""
+    if hasattr(module, "load_data"):
+        if getattr(module.load_data, "cached", False):
+            return module.load_data(namespace)
+        load = functools.partial(module.load_data, namespace)
+    else:
+        def load():
+            return module.parse_data(
+                module.read_data(namespace.input_filename))
+    if namespace.custom:
+        return load()
+    return cache.cached_payload(module, namespace.input_filename, load)
+
+
+def call_compute(compute: Callable, payload: Any, *args, **kwargs) -> Any:
+    """compute(payload), spreading the payload over multiple params"""
+    if isinstance(payload, (tuple, list)):
+        params = [p for p in inspect.signature(compute).parameters.values()
+                  if p.default is p.empty
+                  and p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+        if len(params) - len(args) > 1:
+            return compute(*payload, *args, **kwargs)
+    return compute(payload, *args, **kwargs)
+
+
+def has_part(module: ModuleType, year: int, day: int, part: int) -> bool:
+    if (year, day, part) in SPECIAL_PARTS:
+        return SPECIAL_PARTS[year, day, part] is not None
+    return hasattr(module, f"compute{part}")
+
+
+def backend_available(backend: str) -> bool:
+    return backend == "python" or importlib.util.find_spec(backend) is not None
+
+
+def has_backend(module: ModuleType, year: int, day: int, part: int,
+                backend: str) -> bool:
+    """Whether a part has its own implementation for backend"""
+    if backend == "python":
+        return has_part(module, year, day, part)
+    name = PART_FUNCS.get((year, day, part), f"compute{part}")
+    return (has_part(module, year, day, part)
+            and hasattr(module, f"{name}_{backend}")
+            and backend_available(backend))
+
+
+def backend_func(module: ModuleType, name: str,
+                 namespace: argparse.Namespace) -> Callable:
+    """module.<name>, or its twin for namespace.backend if the day has one"""
+    backend = getattr(namespace, "backend", "python")
+    if backend != "python" and backend_available(backend):
+        func = getattr(module, f"{name}_{backend}", None)
+        if func is not None:
+            return func
+    return getattr(module, name)
+
+
+def load_part(module: ModuleType, year: int, day: int, part: int,
+              namespace: argparse.Namespace) -> Any:
+    """Load a fresh payload for one part"""
+    loader = SPECIAL_LOADS.get((year, day, part), load_payload)
+    return loader(module, namespace)
+
+
+def compute_part(module: ModuleType, year: int, day: int, part: int,
+                 payload: Any, namespace: argparse.Namespace) -> Any:
+    """Compute one part from an already-loaded payload"""
+    func = SPECIAL_PARTS.get((year, day, part))
+    if func is not None:
+        return func(module, payload, namespace)
+    return call_compute(
+        backend_func(module, f"compute{part}", namespace), payload)
+
+
+def run_part(module: ModuleType, year: int, day: int, part: int,
+             namespace: argparse.Namespace) -> Any:
+    """Load a fresh payload and compute one part"""
+    payload = load_part(module, year, day, part, namespace)
+    return compute_part(module, year, day, part, payload, namespace)
+
+
+@special(2021, 5, 1)
+def _vents(m, payload, ns):
+    return backend_func(m, "hydrothermal_vents", ns)(payload, diagonals=False)
+
+
+@special(2021, 5, 2)
+def _vents_diagonal(m, payload, ns):
+    return backend_func(m, "hydrothermal_vents", ns)(payload, diagonals=True)
+
+
+PART_FUNCS[2021, 5, 1] = "hydrothermal_vents"
+PART_FUNCS[2021, 5, 2] = "hydrothermal_vents"
+
+
+@special(2021, 6, 1)
+def _lanternfish80(m, payload, ns):
+    return m.simulate_growth_matrix(payload, 80)
+
+
+@special(2021, 6, 2)
+def _lanternfish256(m, payload, ns):
+    return m.simulate_growth_matrix(payload, 256)
+
+
+@special(2021, 7, 1)
+def _crabs1(m, payload, ns):
+    return backend_func(m, "fuel_align", ns)(payload)
+
+
+@special(2021, 7, 2)
+def _crabs2(m, payload, ns):
+    return backend_func(m, "fuel_align2", ns)(payload)
+
+
+PART_FUNCS[2021, 7, 1] = "fuel_align"
+PART_FUNCS[2021, 7, 2] = "fuel_align2"
+
+
+@special(2021, 10, 1)
+def _syntax_errors(m, payload, ns):
+    return m.score_lines(payload, ns.jobs)[0]
+
+
+@special(2021, 10, 2)
+def _completions(m, payload, ns):
+    return m.middle_score(m.score_lines(payload, ns.jobs)[1])
+
+
+@special(2021, 11, 1)
+def _octopus100(m, payload, ns):
+    return backend_func(m, "compute1", ns)(payload, 100)
+
+
+@special(2021, 11, 2)
+def _octopus_sync(m, payload, ns):
+    return backend_func(m, "compute2", ns)(payload)
+
+
+@special(2021, 14, 1)
+def _polymer10(m, payload, ns):
+    return call_compute(m.compute1, payload, 10)
+
+
+@special(2021, 14, 2)
+def _polymer40(m, payload, ns):
+    return call_compute(m.compute2, payload, 40)
+
+
+@special(2021, 18, 2)
+def _snailfish_pairs(m, payload, ns):
+    return m.largest_magnitude(payload, ns.jobs)
+
+
+@special(2022, 6, 1)
+def _start_of_packet(m, payload, ns):
+    return [m.compute1(tx) for tx in payload]
+
+
+@special(2022, 6, 2)
+def _start_of_message(m, payload, ns):
+    return [m.compute2(tx) for tx in payload]
+
+
+@special(2022, 9, 1)
+def _rope2(m, payload, ns):
+    return m.compute2(payload, knots=2)
+
+
+SPECIAL_PARTS[2022, 14, 2] = None
+
+
+@special(2022, 15, 1)
+def _beacon_row(m, payload, ns):
+    return m.compute1(payload, row=2_000_000 if ns.real else 10)
+
+
+@special(2022, 15, 2)
+def _beacon_search(m, payload, ns):
+    return m.compute2(payload, biggest=4_000_000 if ns.real else 20)
+
+
+@special(2022, 17, 1)
+def _tetris(m, payload, ns):
+    return m.simulate(payload, 2022)
+
+
+# Too slow without cycle detection
+SPECIAL_PARTS[2022, 17, 2] = None
+
+
+@special_load(2023, 1, 2)
+def _trebuchet2(m, ns):
+    # Only the example has a separate part 2 input
+    if ns.real:
+        return load_payload(m, ns)
+    return m.load_data(ns, "2")
@@ -0,0 +1,70 @@
+"""Debug tracing for hot loops that costs nothing when switched off.
+
+Guard every trace point with the module flag, so that the message
+arguments are not even built unless tracing is on::
+
+    if trace.enabled:
+        trace.event("explore1: node=%s path=%s", node, path)
+
+In the innermost loops, copy the flag into a local before the loop and
+test that instead. Formatting is lazy (%-style, done by logging), and
+events can be sampled or rate-limited per message format.
+
+Tracing is switched on by enable(), which the scripts call for
+--verbose, or by the environment::
+
+    AOC_TRACE=1          enable
+    AOC_TRACE_SAMPLE=N   emit only every Nth event of each format
+    AOC_TRACE_RATE=R     emit at most R events per second of each format
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+
+logger = logging.getLogger("aoc.trace")
+
+enabled = False
+sample = 1
+rate = 0.0
+
+_counts: dict[str, int] = {}
+_buckets: dict[str, tuple[float, float]] = {}
+
+
+def enable(on: bool = True, sample_every: int | None = None,
+           max_rate: float | None = None) -> None:
+    """Switch tracing on or off; None keeps the current sampling setting"""
+    global enabled, sample, rate
+    enabled = on
+    if sample_every is not None:
+        sample = max(1, sample_every)
+    if max_rate is not None:
+        rate = max(0.0, max_rate)
+    _counts.clear()
+    _buckets.clear()
+
+
+def event(msg: str, *args) -> None:
+    """Log msg % args at DEBUG, subject to sampling and rate limiting"""
+    if sample > 1:
+        n = _counts[msg] = _counts.get(msg, 0) + 1
+        if (n - 1) % sample:
+            return
+    if rate:
+        # Token bucket per format, holding at most one second's worth
+        now = time.monotonic()
+        tokens, last = _buckets.get(msg, (rate, now))
+        tokens = min(rate, tokens + (now - last) * rate)
+        if tokens < 1:
+            _buckets[msg] = (tokens, now)
+            return
+        _buckets[msg] = (tokens - 1, now)
+    logger.debug(msg, *args)
+
+
+enable(bool(os.environ.get("AOC_TRACE")),
+       int(os.environ.get("AOC_TRACE_SAMPLE", 1)),
+       float(os.environ.get("AOC_TRACE_RATE", 0)))